@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Card:
     """
     Represents a Magic: The Gathering card to be searched.
@@ -30,13 +30,26 @@ class Card:
             raise ValueError("Card name cannot be empty")
         if self.qty < 1:
             raise ValueError("Quantity must be at least 1")
+    
+    @property
+    def key(self) -> str:
+        """
+        Case-insensitive key identifying the card by name.
+        
+        Used everywhere cards are deduplicated, so differently capitalized
+        spellings of a name are merged and searched only once.
+        """
+        return self.name.lower()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Offer:
     """
     Represents a card offer from a specific store.
     
+    Offers are immutable once scraped, so they can be shared between cached
+    results, strategies, and output tables, and used in sets or as dict keys.
+    
     Attributes:
         store: The name of the store (e.g., "FaceToFace")
         card: The card name as listed by the store
@@ -5,22 +5,34 @@ This module provides functionality to aggregate and compare offers from
 multiple stores, identifying the best deals for each card.
 """
 
-from typing import List, Dict
+import heapq
+from math import fsum
+from operator import attrgetter
+from typing import List, Dict, Optional
 from collections import defaultdict
 from mtg_deal_finder.cards import Card, Offer
 
 
-def aggregate_offers(offers: List[Offer]) -> List[Offer]:
+# Sort key shared by the price-ordering helpers
+_PRICE = attrgetter("price")
+
+
+def aggregate_offers(offers: List[Offer], top_k: Optional[int] = None) -> List[Offer]:
     """
     Aggregate offers from multiple stores and sort by price.
     
     Args:
         offers: A list of Offer objects from various stores
+        top_k: Optional number of cheapest offers to return. When set, only
+            those are selected with a heap instead of sorting every offer.
     
     Returns:
         A sorted list of offers, with cheapest first
     """
-    return sorted(offers, key=lambda x: x.price)
+    if top_k is not None:
+        return heapq.nsmallest(top_k, offers, key=_PRICE)
+    
+    return sorted(offers, key=_PRICE)
 
 
 def find_best_deals(offers: List[Offer]) -> Dict[str, Offer]:
@@ -45,10 +57,11 @@ def find_best_deals(offers: List[Offer]) -> Dict[str, Offer]:
     best_deals = {}
     
     for offer in offers:
-        card_key = offer.card
+        # One dict lookup per offer: fetch the current best and compare against it
+        current_best = best_deals.get(offer.card)
         
-        if card_key not in best_deals or offer.price < best_deals[card_key].price:
-            best_deals[card_key] = offer
+        if current_best is None or offer.price < current_best.price:
+            best_deals[offer.card] = offer
     
     return best_deals
 
@@ -79,6 +92,6 @@ def calculate_total_cost(offers: List[Offer]) -> float:
         offers: A list of Offer objects
     
     Returns:
-        The total price as a float
+        The total price as a float, summed exactly with math.fsum
     """
-    return sum(offer.price for offer in offers)
+    return fsum(map(_PRICE, offers))
@@ -7,9 +7,11 @@ comparison workflow.
 """
 
 import logging
+import re
 import sys
 from argparse import ArgumentParser
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional
 
 from mtg_deal_finder.cards import Card, Offer
 from mtg_deal_finder.stores.facetoface import FaceToFaceScraper
@@ -18,10 +20,30 @@ from mtg_deal_finder.stores.topdeckboucherville import TopDeckBouchervilleScrape
 from mtg_deal_finder.stores.topdeckjoliette import TopDeckJolietteScraper
 from mtg_deal_finder.stores.mtgjeuxjubes import MTGJeuxJubesScraper
 from mtg_deal_finder.strategies import get_strategy, AVAILABLE_STRATEGIES
-from mtg_deal_finder.output import export_to_excel, format_results_table
+from mtg_deal_finder.compare import calculate_total_cost
+from mtg_deal_finder.output import build_selected_index, export_to_excel, format_results_table
 from mtg_deal_finder.quality import CardQuality, QUALITY_OPTIONS
 
 
+# Maximum number of store searches running at the same time
+MAX_CONCURRENT_SEARCHES = 16
+
+# Read buffer size used for card list files
+INPUT_BUFFER_SIZE = 1 << 16
+
+# Card line pattern: optional leading quantity ("4", "4x"), the card name,
+# an optional "(SET)" followed by anything such as a collector number, and an
+# optional trailing quantity (" x4" or " x 4"). Anything after the trailing
+# quantity, such as " (SET) 169", is ignored.
+CARD_LINE_PATTERN = re.compile(
+    r'^(?:(?P<lead_qty>\d+)x?\s+)?'
+    r'(?P<name>.+?)'
+    r'(?:\s*\((?P<set>[^)]*)\).*?)?'
+    r'(?:\s+x\s*(?P<trail_qty>\d+).*)?$',
+    re.IGNORECASE
+)
+
+
 # Configure logging
 def setup_logging(debug: bool = False) -> None:
     """
@@ -76,6 +98,21 @@ def parse_arguments() -> ArgumentParser:
         help="Disable caching of search results"
     )
     
+    parser.add_argument(
+        "--only-available",
+        action="store_true",
+        help="Only collect in-stock offers; out-of-stock variants are skipped while parsing "
+             "and left out of the Excel file"
+    )
+    
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=MAX_CONCURRENT_SEARCHES,
+        help=f"Maximum number of store searches to run in parallel "
+             f"(default: {MAX_CONCURRENT_SEARCHES})"
+    )
+    
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -136,7 +173,10 @@ def parse_arguments() -> ArgumentParser:
 
 def deduplicate_cards(cards: List[Card]) -> List[Card]:
     """
-    Deduplicate cards by name, combining quantities.
+    Deduplicate cards by name and set, combining quantities.
+    
+    Names are compared case-insensitively. When set information was discarded
+    every card has set None, so duplicates are merged by name alone.
     
     Args:
         cards: List of Card objects
@@ -147,7 +187,7 @@ def deduplicate_cards(cards: List[Card]) -> List[Card]:
     card_dict = {}
     
     for card in cards:
-        key = card.name.lower()
+        key = (card.key, card.set)
         if key in card_dict:
             # Card already exists, add quantity
             card_dict[key].qty += card.qty
@@ -183,50 +223,22 @@ def parse_card_line(line: str, ignore_set: bool = True) -> Card:
     if not line or line.startswith('#'):
         return None
     
-    # Default values
-    name = line
-    set_code = None
-    qty = 1
-    
-    # Check for Moxfield format first: "QTY Card Name (SET) COLLECTOR_NUMBER"
-    # or simple leading quantity: "QTY Card Name"
-    parts = line.split(None, 1)
-    if len(parts) >= 2 and parts[0].isdigit():
-        # Leading quantity found
-        qty = int(parts[0])
-        name = parts[1].strip()
-    # Check for "4x Card Name" format
-    elif len(parts) >= 2 and parts[0].lower().endswith('x') and parts[0][:-1].isdigit():
-        qty = int(parts[0][:-1])
-        name = parts[1].strip()
-    # Check for "Card Name x4" format
-    elif " x" in line.lower():
-        # Find the position of " x" (case insensitive)
-        lower_line = line.lower()
-        x_pos = lower_line.rfind(" x")
-        # Extract the part before " x" and after " x"
-        name = line[:x_pos].strip()
-        qty_part = line[x_pos+2:].strip()  # Skip " x"
-        # Try to extract quantity, handling potential trailing text like " (SET) 169"
-        # We only want the digits immediately after "x"
-        qty_str = ""
-        for char in qty_part:
-            if char.isdigit():
-                qty_str += char
-            else:
-                break
-        if qty_str:
-            qty = int(qty_str)
-    
-    # Extract set code and collector number (e.g., "(7ED)" or "(MIC) 169")
-    # The collector number will be ignored
-    if "(" in name and ")" in name:
-        start = name.index("(")
-        end = name.index(")")
-        set_code = name[start+1:end].strip()
-        # Remove everything from the opening parenthesis onward
-        # This handles both "(SET)" and "(SET) COLLECTOR_NUMBER"
-        name = name[:start].strip()
+    # Fast path for bare card names, the most common line: without a "(SET)"
+    # and without a leading or trailing digit there is no quantity or set to parse
+    if '(' not in line and not line[0].isdigit() and not line[-1].isdigit():
+        return Card(name=line, qty=1)
+    
+    match = CARD_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    
+    name = match.group('name').strip()
+    qty = int(match.group('lead_qty') or match.group('trail_qty') or 1)
+    
+    # The collector number after "(SET)" is ignored
+    set_code = match.group('set')
+    if set_code is not None:
+        set_code = set_code.strip()
     
     # If ignore_set is True, discard the set information
     if ignore_set:
@@ -244,16 +256,13 @@ def read_cards_from_file(filepath: str, ignore_set: bool = True) -> List[Card]:
         ignore_set: If True, set information is discarded from parsed cards (default: True)
     
     Returns:
-        A list of Card objects, deduplicated if ignore_set is True
+        A list of deduplicated Card objects
     """
-    cards = []
-    
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                card = parse_card_line(line, ignore_set=ignore_set)
-                if card:
-                    cards.append(card)
+        # Read in 64 KiB blocks and parse lines as they are read
+        with open(filepath, 'r', buffering=INPUT_BUFFER_SIZE) as f:
+            parsed = (parse_card_line(line, ignore_set=ignore_set) for line in f)
+            cards = [card for card in parsed if card is not None]
     except FileNotFoundError:
         logging.error(f"Input file not found: {filepath}")
         sys.exit(1)
@@ -261,15 +270,15 @@ def read_cards_from_file(filepath: str, ignore_set: bool = True) -> List[Card]:
         logging.error(f"Error reading input file: {e}")
         sys.exit(1)
     
-    # Deduplicate cards if ignore_set is True
-    if ignore_set:
-        cards = deduplicate_cards(cards)
-    
-    return cards
+    # Merge repeated lines so each card is only searched for once
+    return deduplicate_cards(cards)
 
 
 def search_all_stores(cards: List[Card], store_filter: str = None, use_cache: bool = True, 
-                     topdeckhero_discount: bool = False) -> Dict[str, List[Offer]]:
+                     topdeckhero_discount: bool = False,
+                     max_workers: int = MAX_CONCURRENT_SEARCHES,
+                     only_available: bool = False,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, List[Offer]]:
     """
     Search all configured stores for the given cards.
     
@@ -278,6 +287,10 @@ def search_all_stores(cards: List[Card], store_filter: str = None, use_cache: bo
         store_filter: Optional comma-separated list of store names to search
         use_cache: Whether to use caching for search results (default: True)
         topdeckhero_discount: Whether to apply TopDeck's 20% discount (default: False)
+        max_workers: Maximum number of store searches to run in parallel (default: 16)
+        only_available: Whether to return only in-stock offers (default: False)
+        progress_callback: Optional function called as progress_callback(done, total)
+            from the calling thread each time a store search finishes
     
     Returns:
         A dictionary mapping card names to lists of offers
@@ -286,11 +299,14 @@ def search_all_stores(cards: List[Card], store_filter: str = None, use_cache: bo
     
     # Initialize available scrapers
     scrapers = {
-        "facetoface": FaceToFaceScraper(use_cache=use_cache),
-        "topdeckhero": TopDeckHeroScraper(use_cache=use_cache, apply_discount=topdeckhero_discount),
-        "topdeckboucherville": TopDeckBouchervilleScraper(use_cache=use_cache, apply_discount=topdeckhero_discount),
-        "topdeckjoliette": TopDeckJolietteScraper(use_cache=use_cache, apply_discount=topdeckhero_discount),
-        "mtgjeuxjubes": MTGJeuxJubesScraper(use_cache=use_cache),
+        "facetoface": FaceToFaceScraper(use_cache=use_cache, only_available=only_available),
+        "topdeckhero": TopDeckHeroScraper(use_cache=use_cache, apply_discount=topdeckhero_discount,
+                                          only_available=only_available),
+        "topdeckboucherville": TopDeckBouchervilleScraper(use_cache=use_cache, apply_discount=topdeckhero_discount,
+                                                          only_available=only_available),
+        "topdeckjoliette": TopDeckJolietteScraper(use_cache=use_cache, apply_discount=topdeckhero_discount,
+                                                  only_available=only_available),
+        "mtgjeuxjubes": MTGJeuxJubesScraper(use_cache=use_cache, only_available=only_available),
     }
     
     # Filter scrapers if specified
@@ -308,22 +324,40 @@ def search_all_stores(cards: List[Card], store_filter: str = None, use_cache: bo
     
     logger.info(f"Searching {len(scrapers)} store(s): {', '.join(scrapers.keys())}")
     
+    # Search every (card, store) pair concurrently. Each search is dominated by
+    # network latency, so running them in a thread pool overlaps the round-trips
+    # instead of paying for them one after another.
+    # Stores are searched by name only, so the same name listed under several
+    # sets or spellings is fetched once and its offers are shared by every
+    # entry. The first spelling seen is the one searched and reported.
+    unique_cards = {}
+    for card in cards:
+        unique_cards.setdefault(card.key, card)
+    
+    tasks = [
+        (card, store_name, scraper)
+        for card in unique_cards.values()
+        for store_name, scraper in scrapers.items()
+    ]
+    
     # Collect all offers for each card
-    card_offers = {}
+    card_offers = {card.name: [] for card in unique_cards.values()}
     
-    for card in cards:
-        logger.info(f"\nSearching for: {card.name}")
-        all_offers = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(scraper.search, card) for card, _, scraper in tasks]
+        
+        if progress_callback:
+            for done, _ in enumerate(as_completed(futures), 1):
+                progress_callback(done, len(futures))
         
-        for store_name, scraper in scrapers.items():
+        # Gather results in submission order so offers keep a stable card/store ordering
+        for (card, store_name, _), future in zip(tasks, futures):
             try:
-                offers = scraper.search(card)
-                all_offers.extend(offers)
-                logger.info(f"  {store_name}: Found {len(offers)} offer(s)")
+                offers = future.result()
+                card_offers[card.name].extend(offers)
+                logger.info(f"  {store_name}: Found {len(offers)} offer(s) for {card.name}")
             except Exception as e:
-                logger.error(f"  {store_name}: Error searching - {e}")
-        
-        card_offers[card.name] = all_offers
+                logger.error(f"  {store_name}: Error searching for {card.name} - {e}")
     
     return card_offers
 
@@ -338,7 +372,8 @@ def select_best_offers(
     Select the best offer for each card based on the given strategy.
     
     Args:
-        card_offers: A dictionary mapping card names to lists of offers
+        card_offers: A dictionary mapping card names to lists of offers. Names
+            are matched to cards case-insensitively.
         cards: Original list of Card objects (for quantity info)
         strategy_name: Name of the selection strategy to use
         min_quality: Minimum quality level to filter offers, or None for no restriction
@@ -361,14 +396,19 @@ def select_best_offers(
     
     selected_offers = []
     
+    # Select for every card up front, then report in deck order
+    best_offers = strategy.select_many(card_offers)
+    
+    # search_all_stores keys each card by the first spelling it saw
+    names_by_key = {name.lower(): name for name in card_offers}
+    
     for card in cards:
-        offers = card_offers.get(card.name, [])
-        
-        if not offers:
+        name = names_by_key.get(card.key, card.name)
+        if not card_offers.get(name):
             logger.warning(f"No offers found for: {card.name}")
             continue
         
-        best_offer = strategy.select(offers)
+        best_offer = best_offers[name]
         
         if best_offer:
             logger.info(f"Selected for {card.name}: ${best_offer.price:.2f} from {best_offer.store}")
@@ -411,6 +451,10 @@ def main() -> None:
         logger.info("For more information, use: --help")
         return
     
+    if args.max_workers < 1:
+        logger.error(f"Invalid --max-workers value: {args.max_workers} (must be at least 1)")
+        return
+    
     # Read cards from input file
     logger.info(f"Reading cards from: {args.input_file}")
     cards = read_cards_from_file(args.input_file, ignore_set=args.ignore_set)
@@ -429,10 +473,15 @@ def main() -> None:
     if args.topdeckhero_discount:
         logger.info("TopDeck 20% discount will be applied to prices for all TopDeck stores")
     card_offers = search_all_stores(cards, args.store, use_cache=not args.no_cache, 
-                                   topdeckhero_discount=args.topdeckhero_discount)
+                                   topdeckhero_discount=args.topdeckhero_discount,
+                                   max_workers=args.max_workers,
+                                   only_available=args.only_available)
     
-    # Calculate total offers found from stores
-    total_offers = sum(len(offers) for offers in card_offers.values())
+    # Collect all offers for Excel export, counting them as they are collected
+    all_offers = []
+    for offers in card_offers.values():
+        all_offers.extend(offers)
+    total_offers = len(all_offers)
     logger.info(f"\nTotal offers found from stores: {total_offers}")
     
     if total_offers == 0:
@@ -456,25 +505,24 @@ def main() -> None:
         logger.warning("No suitable offers selected. Exiting.")
         return
     
+    # Build the selected-offer lookup once and share it between the console
+    # table and the Excel export
+    selected_index = build_selected_index(selected_offers)
+    
     # Display results (only selected offers in console for brevity)
     logger.info("\n" + "=" * 50)
     logger.info("SELECTED BEST DEALS:")
     logger.info("=" * 50)
-    logger.info("\n" + format_results_table(selected_offers))
+    logger.info("\n" + format_results_table(selected_offers, selected_index=selected_index))
     
     # Calculate total cost
-    total_cost = sum(offer.price for offer in selected_offers)
+    total_cost = calculate_total_cost(selected_offers)
     logger.info(f"\nTotal cost: ${total_cost:.2f}")
     
-    # Collect all offers for Excel export
-    all_offers = []
-    for offers in card_offers.values():
-        all_offers.extend(offers)
-    
     # Export all offers to Excel with selected ones marked
     try:
-        export_to_excel(all_offers, args.out, selected_offers)
-        logger.info(f"\nResults exported to: {args.out}")
+        output_path = export_to_excel(all_offers, args.out, selected_index=selected_index)
+        logger.info(f"\nResults exported to: {output_path}")
         logger.info(f"Excel file contains all {len(all_offers)} offers with selected offers marked")
     except Exception as e:
         logger.error(f"Error exporting to Excel: {e}")
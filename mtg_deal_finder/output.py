@@ -5,65 +5,195 @@ This module provides functionality to export card offers and price
 comparisons to Excel spreadsheets using pandas.
 """
 
-from typing import List
+from operator import attrgetter
+from typing import TYPE_CHECKING, BinaryIO, FrozenSet, Iterable, List, Optional, Union
 from pathlib import Path
-import pandas as pd
 from mtg_deal_finder.cards import Offer
 
+# pandas is imported inside the functions that need it so that commands which
+# never build a table (such as --help) don't pay for importing it
+if TYPE_CHECKING:
+    import pandas as pd
 
-def create_dataframe(offers: List[Offer], selected_offers: List[Offer] = None) -> pd.DataFrame:
+
+# Column order used for every offers table (DataFrame, Excel, console)
+COLUMNS = ["Selected", "Query", "Card", "Set", "Condition", "Foil", "Price", "Quantity", "Store", "URL"]
+
+# Excel sheet layout
+SHEET_NAME = "Offers"
+PRICE_FORMAT = "$#,##0.00"
+
+# Offer count above which export_to_excel streams rows straight to the workbook
+# instead of building a DataFrame first
+STREAMING_EXPORT_THRESHOLD = 10_000
+
+# Offer attributes backing every column after "Selected", in column order.
+# "availability" fills the Quantity column and is converted to 1/0 afterwards.
+_OFFER_FIELDS = attrgetter(
+    "query", "card", "set", "condition", "foil", "price", "availability", "store", "url"
+)
+
+
+def build_selected_index(selected_offers: Optional[Iterable[Offer]]) -> FrozenSet[int]:
+    """
+    Build the lookup set used to mark selected offers in output tables.
+    
+    Selected offers are the same objects as the ones in the searched offer lists
+    (strategies pick from those lists), so identity is enough to recognize them.
+    Build it once and pass it as selected_index to each output function.
+    
+    Args:
+        selected_offers: The selected Offer objects, or None
+    
+    Returns:
+        A frozenset of the ids of the selected offers
+    """
+    return frozenset(map(id, selected_offers or ()))
+
+
+def create_dataframe(offers: List[Offer], selected_offers: List[Offer] = None,
+                     selected_index: Optional[FrozenSet[int]] = None) -> "pd.DataFrame":
     """
     Convert a list of offers to a pandas DataFrame.
     
     Args:
         offers: A list of Offer objects
-        selected_offers: Optional list of selected offers to mark in the dataframe
+        selected_offers: Optional list of selected offers to mark in the dataframe.
+                         These must be the same Offer objects found in offers.
+        selected_index: Optional result of build_selected_index; when given,
+                        it is used instead of selected_offers
     
     Returns:
         A pandas DataFrame with columns for all offer attributes
     """
+    import pandas as pd
+    
     if not offers:
         # Return empty DataFrame with expected columns
-        return pd.DataFrame(columns=["Selected", "Query", "Card", "Set", "Condition", "Foil", "Price", "Quantity", "Store", "URL"])
-    
-    # Create a set of selected offer identifiers for quick lookup
-    # Use a combination of attributes to uniquely identify an offer
-    selected_set = set()
-    if selected_offers:
-        for offer in selected_offers:
-            # Use URL, condition, price, and foil as unique identifier
-            selected_set.add((offer.url, offer.condition, offer.price, offer.foil))
-    
-    # Determine which offers are selected
-    is_selected = []
-    for offer in offers:
-        offer_id = (offer.url, offer.condition, offer.price, offer.foil)
-        is_selected.append("✓" if offer_id in selected_set else "")
-    
-    data = {
-        "Selected": is_selected,
-        "Query": [offer.query for offer in offers],
-        "Card": [offer.card for offer in offers],
-        "Set": [offer.set for offer in offers],
-        "Condition": [offer.condition for offer in offers],
-        "Foil": [offer.foil for offer in offers],
-        "Price": [offer.price for offer in offers],
-        "Quantity": [1 if offer.availability else 0 for offer in offers],
-        "Store": [offer.store for offer in offers],
-        "URL": [offer.url for offer in offers],
-    }
-    
-    return pd.DataFrame(data)
-
-
-def export_to_excel(offers: List[Offer], output_path: str, selected_offers: List[Offer] = None) -> None:
+        return pd.DataFrame(columns=COLUMNS)
+    
+    if selected_index is None:
+        selected_index = build_selected_index(selected_offers)
+    
+    # Extract every row with a C-level attrgetter instead of per-attribute Python code
+    df = pd.DataFrame.from_records(map(_OFFER_FIELDS, offers), columns=COLUMNS[1:])
+    df["Quantity"] = df["Quantity"].astype(int)
+    df.insert(0, "Selected", ["✓" if id(offer) in selected_index else "" for offer in offers])
+    
+    return df
+
+
+def create_sorted_dataframe(offers: List[Offer], selected_offers: List[Offer] = None,
+                            selected_index: Optional[FrozenSet[int]] = None) -> "pd.DataFrame":
+    """
+    Convert offers to a DataFrame sorted for display and export.
+    
+    Rows are sorted by Query, then selected offers first, then by Price.
+    Build this once and pass it to export_to_excel and format_results_table
+    to avoid rebuilding and re-sorting the same table.
+    
+    Args:
+        offers: A list of Offer objects
+        selected_offers: Optional list of selected offers to mark in the dataframe
+        selected_index: Optional result of build_selected_index; when given,
+                        it is used instead of selected_offers
+    
+    Returns:
+        A sorted pandas DataFrame with the same columns as create_dataframe
+    """
+    df = create_dataframe(offers, selected_offers, selected_index)
+    
+    # Sort by Query, then Selected (selected first), then Price
+    if not df.empty:
+        df = df.sort_values(by=["Query", "Selected", "Price"], ascending=[True, False, True])
+    
+    return df
+
+
+def write_excel(df: "pd.DataFrame", target: Union[str, Path, BinaryIO]) -> None:
+    """
+    Write an offers DataFrame to an Excel workbook with xlsxwriter.
+    
+    The Price column gets a currency format and the header row is frozen so it
+    stays visible while scrolling.
+    
+    Args:
+        df: The offers DataFrame, as built by create_dataframe
+        target: A file path or a binary buffer to write the workbook to
+    """
+    import pandas as pd
+    
+    with pd.ExcelWriter(target, engine="xlsxwriter") as writer:
+        df.to_excel(writer, sheet_name=SHEET_NAME, index=False)
+        worksheet = writer.sheets[SHEET_NAME]
+        
+        if "Price" in df.columns:
+            price_col = df.columns.get_loc("Price")
+            money = writer.book.add_format({"num_format": PRICE_FORMAT})
+            worksheet.set_column(price_col, price_col, 10, money)
+        
+        worksheet.freeze_panes(1, 0)
+
+
+def write_excel_streaming(offers: List[Offer], target: Union[str, Path, BinaryIO],
+                          selected_index: FrozenSet[int] = frozenset()) -> None:
+    """
+    Write offers to an Excel workbook row by row, without building a DataFrame.
+    
+    The workbook is opened in xlsxwriter's constant_memory mode, which flushes
+    each row to disk as it is written, so memory stays flat for very large offer
+    lists. Rows, columns and formatting match write_excel on a DataFrame built by
+    create_sorted_dataframe.
+    
+    Args:
+        offers: A list of Offer objects
+        target: A file path or a binary buffer to write the workbook to
+        selected_index: Result of build_selected_index for the offers to mark
+    """
+    import xlsxwriter
+    
+    rows = sorted(offers, key=lambda o: (o.query, id(o) not in selected_index, o.price))
+    
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet(SHEET_NAME)
+        price_col = COLUMNS.index("Price")
+        money = workbook.add_format({"num_format": PRICE_FORMAT})
+        worksheet.set_column(price_col, price_col, 10, money)
+        worksheet.freeze_panes(1, 0)
+        
+        worksheet.write_row(0, 0, COLUMNS, workbook.add_format({"bold": True}))
+        for row_num, offer in enumerate(rows, 1):
+            query, card, set_code, condition, foil, price, available, store, url = _OFFER_FIELDS(offer)
+            worksheet.write_row(row_num, 0, (
+                "✓" if id(offer) in selected_index else "",
+                query, card, set_code, condition, foil, price, int(available), store, url,
+            ))
+    finally:
+        workbook.close()
+
+
+def export_to_excel(offers: List[Offer], output_path: str, selected_offers: List[Offer] = None,
+                    df: Optional["pd.DataFrame"] = None,
+                    selected_index: Optional[FrozenSet[int]] = None) -> Path:
     """
     Export offers to an Excel file.
     
+    Offer lists larger than STREAMING_EXPORT_THRESHOLD are streamed to the file
+    with write_excel_streaming unless a DataFrame is passed in.
+    
     Args:
         offers: A list of all Offer objects
         output_path: The path where the Excel file should be saved
         selected_offers: Optional list of selected offers to mark in the output
+        df: Optional DataFrame already built by create_sorted_dataframe; when given,
+            offers and selected_offers are not used to rebuild it
+        selected_index: Optional result of build_selected_index; when given,
+            it is used instead of selected_offers
+    
+    Returns:
+        The path the workbook was written to. Its suffix is always .xlsx,
+        replacing any other suffix given in output_path.
     
     Raises:
         ValueError: If output_path is invalid
@@ -76,42 +206,90 @@ def export_to_excel(offers: List[Offer], output_path: str, selected_offers: List
     if not output_path:
         raise ValueError("Output path cannot be empty")
     
-    # Ensure .xlsx extension
+    # Ensure .xlsx extension (xlsxwriter cannot write legacy .xls files)
     path = Path(output_path)
-    if path.suffix.lower() not in ['.xlsx', '.xls']:
+    if path.suffix.lower() != '.xlsx':
         path = path.with_suffix('.xlsx')
     
-    # Create DataFrame
-    df = create_dataframe(offers, selected_offers)
-    
-    # Sort by Query, then Selected (selected first), then Price
-    if not df.empty:
-        df = df.sort_values(by=["Query", "Selected", "Price"], ascending=[True, False, True])
+    if selected_index is None:
+        selected_index = build_selected_index(selected_offers)
     
     # Export to Excel
     try:
-        df.to_excel(str(path), index=False, engine='openpyxl')
+        if df is None and len(offers) > STREAMING_EXPORT_THRESHOLD:
+            write_excel_streaming(offers, str(path), selected_index)
+            return path
+        
+        if df is None:
+            df = create_sorted_dataframe(offers, selected_index=selected_index)
+        write_excel(df, str(path))
     except Exception as e:
         raise IOError(f"Failed to write Excel file: {e}")
+    
+    return path
 
 
-def format_results_table(offers: List[Offer], selected_offers: List[Offer] = None) -> str:
+def format_results_table(offers: List[Offer], selected_offers: List[Offer] = None,
+                         df: Optional["pd.DataFrame"] = None,
+                         selected_index: Optional[FrozenSet[int]] = None) -> str:
     """
     Format offers as a text table for console output.
     
+    The table is formatted directly from the offers with plain string
+    operations, which is much cheaper than building a DataFrame just to print
+    it. Rows are sorted like create_sorted_dataframe: by Query, then selected
+    offers first, then by Price.
+    
     Args:
         offers: A list of Offer objects
-        selected_offers: Optional list of selected offers to mark in the table
+        selected_offers: Optional list of selected offers to mark in the table.
+            These must be the same objects as in offers.
+        df: Optional DataFrame already built by create_sorted_dataframe; when given,
+            it is rendered as-is and offers and selected_offers are not used
+        selected_index: Optional result of build_selected_index; when given,
+            it is used instead of selected_offers
     
     Returns:
         A formatted string representation of the offers
     """
+    if df is not None:
+        return df.to_string(index=False) if not df.empty else "No offers found."
+    
     if not offers:
         return "No offers found."
     
-    df = create_dataframe(offers, selected_offers)
+    if selected_index is None:
+        selected_index = build_selected_index(selected_offers)
     
-    # Sort by Query, then Selected (selected first), then Price
-    df = df.sort_values(by=["Query", "Selected", "Price"], ascending=[True, False, True])
+    rows = sorted(offers, key=lambda o: (o.query, id(o) not in selected_index, o.price))
+    
+    # Same columns as the DataFrame and Excel outputs; the URL is the only way
+    # to find a listing from the console
+    header = tuple(COLUMNS)
+    cells = [
+        (
+            "✓" if id(o) in selected_index else "",
+            o.query,
+            o.card,
+            o.set or "",
+            o.condition,
+            str(o.foil),
+            f"{o.price:.2f}",
+            str(int(o.availability)),
+            o.store,
+            o.url,
+        )
+        for o in rows
+    ]
+    widths = [max(map(len, column)) for column in zip(header, *cells)]
+    right_aligned = (header.index("Price"), header.index("Quantity"))
+    
+    lines = []
+    for row in (header, *cells):
+        padded = [
+            cell.rjust(width) if i in right_aligned else cell.ljust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        ]
+        lines.append("  ".join(padded).rstrip())
     
-    return df.to_string(index=False)
+    return "\n".join(lines)
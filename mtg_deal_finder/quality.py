@@ -6,6 +6,7 @@ allowing users to filter cards based on minimum quality requirements.
 """
 
 from enum import IntEnum
+from functools import lru_cache
 from typing import Optional
 
 
@@ -41,30 +42,7 @@ class CardQuality(IntEnum):
         if not condition:
             return None
         
-        # Normalize the condition string
-        condition_lower = condition.lower().strip()
-        
-        # Map various condition formats to CardQuality values
-        condition_map = {
-            # Full names
-            'mint': cls.MINT,
-            'm': cls.MINT,
-            'near mint': cls.NEAR_MINT,
-            'nm': cls.NEAR_MINT,
-            'lightly played': cls.LIGHTLY_PLAYED,
-            'lp': cls.LIGHTLY_PLAYED,
-            'moderately played': cls.MODERATELY_PLAYED,
-            'mp': cls.MODERATELY_PLAYED,
-            'played': cls.PLAYED,
-            'pl': cls.PLAYED,
-            'p': cls.PLAYED,
-            'heavily played': cls.HEAVILY_PLAYED,
-            'hp': cls.HEAVILY_PLAYED,
-            'damaged': cls.DAMAGED,
-            'dmg': cls.DAMAGED,
-        }
-        
-        return condition_map.get(condition_lower)
+        return _CONDITION_MAP.get(condition.lower().strip())
     
     def to_display_name(self) -> str:
         """
@@ -73,26 +51,57 @@ class CardQuality(IntEnum):
         Returns:
             A formatted string representation of the quality level
         """
-        display_names = {
-            CardQuality.MINT: "Mint",
-            CardQuality.NEAR_MINT: "Near Mint",
-            CardQuality.LIGHTLY_PLAYED: "Lightly Played",
-            CardQuality.MODERATELY_PLAYED: "Moderately Played",
-            CardQuality.PLAYED: "Played",
-            CardQuality.HEAVILY_PLAYED: "Heavily Played",
-            CardQuality.DAMAGED: "Damaged",
-        }
-        return display_names.get(self, "Unknown")
+        return _DISPLAY_NAMES.get(self, "Unknown")
+
+
+# Condition strings (lowercased) mapped to quality levels, built once at import
+# time so lookups are a single dict access
+_CONDITION_MAP = {
+    # Full names
+    'mint': CardQuality.MINT,
+    'm': CardQuality.MINT,
+    'near mint': CardQuality.NEAR_MINT,
+    'nm': CardQuality.NEAR_MINT,
+    'lightly played': CardQuality.LIGHTLY_PLAYED,
+    'lp': CardQuality.LIGHTLY_PLAYED,
+    'moderately played': CardQuality.MODERATELY_PLAYED,
+    'mp': CardQuality.MODERATELY_PLAYED,
+    'played': CardQuality.PLAYED,
+    'pl': CardQuality.PLAYED,
+    'p': CardQuality.PLAYED,
+    'heavily played': CardQuality.HEAVILY_PLAYED,
+    'hp': CardQuality.HEAVILY_PLAYED,
+    'damaged': CardQuality.DAMAGED,
+    'dmg': CardQuality.DAMAGED,
+}
 
+# Same map with plain int ranks, so quality checks compare ints directly instead
+# of going through IntEnum comparison
+_CONDITION_RANKS = {condition: int(quality) for condition, quality in _CONDITION_MAP.items()}
+
+# Human-readable name for each quality level
+_DISPLAY_NAMES = {
+    CardQuality.MINT: "Mint",
+    CardQuality.NEAR_MINT: "Near Mint",
+    CardQuality.LIGHTLY_PLAYED: "Lightly Played",
+    CardQuality.MODERATELY_PLAYED: "Moderately Played",
+    CardQuality.PLAYED: "Played",
+    CardQuality.HEAVILY_PLAYED: "Heavily Played",
+    CardQuality.DAMAGED: "Damaged",
+}
 
 # Available quality options for CLI help text
 QUALITY_OPTIONS = ["mint", "nm", "lp", "mp", "played", "hp", "damaged"]
 
 
+@lru_cache(maxsize=256)
 def meets_minimum_quality(condition: str, min_quality: Optional[CardQuality]) -> bool:
     """
     Check if a card condition meets the minimum quality requirement.
     
+    Results are memoized: stores only use a handful of condition strings, so
+    after the first few offers every check is a single cache hit.
+    
     Args:
         condition: The condition string of the card offer
         min_quality: The minimum required quality level, or None for no restriction
@@ -105,9 +114,28 @@ def meets_minimum_quality(condition: str, min_quality: Optional[CardQuality]) ->
     if min_quality is None:
         return True
     
-    card_quality = CardQuality.from_string(condition)
-    if card_quality is None:
-        # Unknown condition - be conservative and reject it
-        return False
+    # Unknown conditions rank 0, below every quality level - be conservative
+    # and reject them
+    return condition_rank(condition) >= int(min_quality)
+
+
+@lru_cache(maxsize=256)
+def condition_rank(condition: str) -> int:
+    """
+    Get the integer quality rank of a card condition.
+    
+    Lets callers that check many offers against the same minimum convert it to
+    an int once and compare plain ints, with a cache keyed on the condition
+    string alone.
+    
+    Args:
+        condition: The condition string of the card offer
+    
+    Returns:
+        The CardQuality value of the condition as a plain int, or 0 if the
+        condition cannot be parsed
+    """
+    if not condition:
+        return 0
     
-    return card_quality >= min_quality
+    return _CONDITION_RANKS.get(condition.lower().strip(), 0)
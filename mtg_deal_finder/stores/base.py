@@ -5,9 +5,15 @@ This module defines the StoreScraper interface that all store-specific
 scrapers must implement to ensure consistency across different stores.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import Iterator, List
+import requests
+
 from mtg_deal_finder.cards import Card, Offer
+from mtg_deal_finder.utils.http import rate_limit_delay
 
 
 class StoreScraper(ABC):
@@ -19,6 +25,21 @@ class StoreScraper(ABC):
     across different stores.
     """
     
+    # Maximum number of requests in flight to one store at a time, however many
+    # searches run concurrently
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    def __init_subclass__(cls, **kwargs):
+        """Give each store its own request slots and pacing, shared by all its instances."""
+        super().__init_subclass__(**kwargs)
+        cls._request_slots = threading.BoundedSemaphore(cls.MAX_CONCURRENT_REQUESTS)
+        
+        # Spacing between requests asked for by the store's rate-limit headers,
+        # and the earliest time the next request may be sent
+        cls._pacing_lock = threading.Lock()
+        cls._request_interval = 0.0
+        cls._next_request_at = 0.0
+    
     @abstractmethod
     def search(self, card: Card) -> List[Offer]:
         """
@@ -36,3 +57,43 @@ class StoreScraper(ABC):
                       network errors, parsing errors, etc.
         """
         pass
+    
+    @contextmanager
+    def fetch(self, url: str, **kwargs) -> Iterator[requests.Response]:
+        """
+        Send a GET request to the store through the scraper's session.
+        
+        Waits for one of the store's MAX_CONCURRENT_REQUESTS slots first, so
+        concurrent searches never flood a single store with requests. Requests
+        are then spaced out as the store's rate-limit headers ask, if it sends
+        any. Rate limiting and transient errors are retried with backoff by
+        the session.
+        
+        Use it as a context manager. The slot is held until the with block
+        exits, so a streamed body (stream=True) is downloaded while the slot
+        is still taken. The response is closed on exit.
+        
+        Args:
+            url: The URL to request
+            **kwargs: Extra arguments passed on to requests.Session.get
+        
+        Yields:
+            The requests.Response
+        """
+        cls = type(self)
+        
+        with self._request_slots:
+            # Reserve the next send time under the lock, then wait outside it
+            with cls._pacing_lock:
+                now = time.monotonic()
+                send_at = max(now, cls._next_request_at)
+                cls._next_request_at = send_at + cls._request_interval
+            if send_at > now:
+                time.sleep(send_at - now)
+            
+            response = self.session.get(url, **kwargs)
+            
+            with response:
+                with cls._pacing_lock:
+                    cls._request_interval = rate_limit_delay(response)
+                yield response
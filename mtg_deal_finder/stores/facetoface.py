@@ -7,20 +7,31 @@ a Canadian Magic: The Gathering card store.
 
 import logging
 import re
-import time
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from urllib.parse import quote_plus
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to requests' stdlib json decoding
+    orjson = None
+
 from mtg_deal_finder.cards import Card, Offer
 from mtg_deal_finder.stores.base import StoreScraper
 from mtg_deal_finder.utils.caching import load_from_cache, save_to_cache
+from mtg_deal_finder.utils.http import get_shared_session
 from mtg_deal_finder.utils.normalization import card_name_matches_query
 
 
 logger = logging.getLogger(__name__)
 
+# Number of product titles whose parsed name, set, foil and language flags are
+# memoized. Every variant of a product shares its title, and the same products
+# come back across pages and repeated searches.
+TITLE_CACHE_SIZE = 1024
+
 
 class FaceToFaceScraper(StoreScraper):
     """
@@ -44,19 +55,34 @@ class FaceToFaceScraper(StoreScraper):
         'DMG': 'Damaged',
     }
     
-    def __init__(self, use_cache: bool = True):
+    # Title markers of non-English printings
+    LANGUAGE_MARKERS = [
+        ' - french', ' - japanese', ' - german', ' - spanish', ' - italian',
+        ' - portuguese', ' - russian', ' - korean', ' - chinese',
+        ' - simplified chinese', ' - traditional chinese'
+    ]
+    
+    # Title patterns, compiled once when the class is loaded. All language
+    # markers are combined into one pattern so a title is scanned only once.
+    _BRACKET_RE = re.compile(r'\[([^\]]+)\]')
+    _CLEAN_RE = re.compile(r'\[[^\]]+\]|\bfoil\b', re.I)
+    _LANGUAGE_RE = re.compile('|'.join(map(re.escape, LANGUAGE_MARKERS)), re.I)
+    
+    def __init__(self, use_cache: bool = True, only_available: bool = False):
         """
-        Initialize the scraper with a requests session.
+        Initialize the scraper with the shared pooled requests session.
         
         Args:
             use_cache: Whether to use caching for search results (default: True)
+            only_available: Whether to skip out-of-stock variants while parsing (default: False)
         """
-        self.session = requests.Session()
-        # Set a user agent to appear as a regular browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = get_shared_session()
         self.use_cache = use_cache
+        self.only_available = only_available
+        
+        # In-stock-only results are cached apart from full results so that a
+        # later unfiltered search never reads a partial entry
+        self.cache_name = f"{self.STORE_NAME}-instock" if only_available else self.STORE_NAME
     
     def search(self, card: Card, max_pages: int = 2) -> List[Offer]:
         """
@@ -75,32 +101,35 @@ class FaceToFaceScraper(StoreScraper):
             
             # Check cache first
             if self.use_cache:
-                cached_data = load_from_cache(self.STORE_NAME, card.name)
-                if cached_data:
+                cached_data = load_from_cache(self.cache_name, card.name)
+                if cached_data is not None:
                     logger.info(f"Using cached data for {card.name}")
                     # Convert cached data back to Offer objects
-                    return self._deserialize_offers(cached_data)
+                    return self._deserialize_offers(cached_data, query=card.name)
             
             # Collect offers from multiple pages
             all_offers = []
             
+            # Encode the search query once for every page
+            # Note: The FaceToFaceGames API expects double URL encoding for the search query.
+            # This is because the API internally decodes the query twice - once at the web server level
+            # and once at the application level. Single encoding would result in incorrect search queries.
+            search_query = quote_plus(quote_plus(card.name))
+            search_url = f"{self.API_URL}/keyword/{search_query}/pageSize/50/page/"
+            
             for page_num in range(1, max_pages + 1):
                 logger.debug(f"Fetching page {page_num} for {card.name}")
                 
                 # Construct API URL
-                # Note: The FaceToFaceGames API expects double URL encoding for the search query.
-                # This is because the API internally decodes the query twice - once at the web server level
-                # and once at the application level. Single encoding would result in incorrect search queries.
-                search_query = quote_plus(quote_plus(card.name))
-                api_url = f"{self.API_URL}/keyword/{search_query}/pageSize/50/page/{page_num}"
+                api_url = f"{search_url}{page_num}"
                 
                 # Make the request
                 logger.debug(f"Fetching API: {api_url}")
-                response = self.session.get(api_url, timeout=10)
-                response.raise_for_status()
-                
-                # Parse JSON response
-                data = response.json()
+                with self.fetch(api_url, timeout=10) as response:
+                    response.raise_for_status()
+                    
+                    # Parse JSON response, straight from the raw bytes with orjson when available
+                    data = orjson.loads(response.content) if orjson is not None else response.json()
                 
                 # Extract offers from the hits
                 page_offers = self._parse_api_response(data, card.name)
@@ -110,16 +139,13 @@ class FaceToFaceScraper(StoreScraper):
                     break
                 
                 all_offers.extend(page_offers)
-                
-                # Add a small delay between pages to be polite
-                if page_num < max_pages:
-                    time.sleep(0.5)
             
             logger.info(f"Found {len(all_offers)} offer(s) for {card.name}")
             
-            # Save to cache
-            if self.use_cache and all_offers:
-                save_to_cache(self.STORE_NAME, card.name, self._serialize_offers(all_offers))
+            # Save to cache, including empty results so cards a store doesn't
+            # carry aren't searched again on every run
+            if self.use_cache:
+                save_to_cache(self.cache_name, card.name, self._serialize_offers(all_offers))
             
             return all_offers
             
@@ -144,32 +170,46 @@ class FaceToFaceScraper(StoreScraper):
         offers = []
         
         try:
-            hits = data.get('hits', {}).get('hits', [])
-            logger.debug(f"Processing {len(hits)} product hits")
-            
-            for hit in hits:
-                source = hit.get('_source', {})
+            hits = data['hits']['hits']
+        except (KeyError, TypeError):
+            logger.debug("API response has no product hits")
+            return offers
+        
+        logger.debug(f"Processing {len(hits)} product hits")
+        
+        for hit in hits:
+            try:
+                source = hit['_source']
+                title = source.get('title', '')
                 
                 # Filter out non-English cards
-                if self._is_non_english(source.get('title', '')):
-                    logger.debug(f"Skipping non-English card: {source.get('title', '')}")
+                if self._is_non_english(title):
+                    logger.debug(f"Skipping non-English card: {title}")
                     continue
                 
+                # Every variant shares the product's card name, so products
+                # that don't match the query are rejected before any variant
+                # is parsed
+                clean_name = self._clean_card_name(title)
+                if not card_name_matches_query(clean_name, card_name):
+                    logger.debug(f"Rejected product: '{clean_name}' doesn't match query '{card_name}'")
+                    continue
+                
+                # A null or malformed variants field only skips this hit
+                variants = source.get('variants') or ()
+                
                 # Process each variant (different conditions)
-                variants = source.get('variants', [])
                 for variant in variants:
                     try:
                         offer = self._parse_variant(source, variant, card_name)
-                        if offer and card_name_matches_query(offer.card, card_name):
+                        if offer:
                             offers.append(offer)
-                        elif offer:
-                            logger.debug(f"Rejected offer: '{offer.card}' doesn't match query '{card_name}'")
                     except Exception as e:
                         logger.debug(f"Error parsing variant: {e}")
                         continue
-            
-        except Exception as e:
-            logger.error(f"Error parsing API response: {e}")
+            except (KeyError, TypeError, AttributeError) as e:
+                logger.debug(f"Skipping malformed product hit: {e}")
+                continue
         
         return offers
     
@@ -194,18 +234,21 @@ class FaceToFaceScraper(StoreScraper):
         if price is None:
             return None
         
-        # Extract inventory and availability
+        # Extract inventory and availability, skipping out-of-stock variants
+        # before any title parsing when only available offers are wanted
         inventory = variant.get('inventoryQuantity', 0)
         is_available = inventory > 0
+        if self.only_available and not is_available:
+            return None
         
-        # Extract condition from selectedOptions
-        condition = 'Unknown'
-        selected_options = variant.get('selectedOptions', [])
-        for option in selected_options:
-            if option.get('name') == 'Condition':
-                condition_code = option.get('value', 'Unknown')
-                condition = self.CONDITION_MAP.get(condition_code, condition_code)
-                break
+        # Extract condition from selectedOptions, mapped by option name so other
+        # options (finish, language) can be looked up without rescanning
+        options = {
+            option.get('name'): option.get('value', 'Unknown')
+            for option in variant.get('selectedOptions', ())
+        }
+        condition_code = options.get('Condition', 'Unknown')
+        condition = self.CONDITION_MAP.get(condition_code, condition_code)
         
         # Determine if foil
         is_foil = self._is_foil(title)
@@ -219,19 +262,24 @@ class FaceToFaceScraper(StoreScraper):
         # Construct product URL
         url = f"{self.BASE_URL}/products/{handle}"
         
+        # Positional arguments, in Offer field order, avoid building a keyword dict
+        # for every variant: store, card, set, condition, price, url, foil,
+        # availability, query
         return Offer(
-            store=self.STORE_NAME,
-            card=clean_name,
-            set=card_set,
-            condition=condition,
-            price=price,
-            url=url,
-            foil=is_foil,
-            availability=is_available,
-            query=card_name
+            self.STORE_NAME,
+            clean_name,
+            card_set,
+            condition,
+            price,
+            url,
+            is_foil,
+            is_available,
+            card_name,
         )
     
-    def _is_non_english(self, title: str) -> bool:
+    @classmethod
+    @lru_cache(maxsize=TITLE_CACHE_SIZE)
+    def _is_non_english(cls, title: str) -> bool:
         """
         Check if a card title indicates a non-English version.
         
@@ -244,20 +292,11 @@ class FaceToFaceScraper(StoreScraper):
         # Look for language markers in the title
         # FaceToFaceGames formats non-English cards as: "Card Name - Language [Set]"
         # Example: "Lightning Bolt - Japanese [123] [Set Name] [Foil]"
-        language_markers = [
-            ' - french', ' - japanese', ' - german', ' - spanish', ' - italian',
-            ' - portuguese', ' - russian', ' - korean', ' - chinese', 
-            ' - simplified chinese', ' - traditional chinese'
-        ]
-        
-        title_lower = title.lower()
-        for marker in language_markers:
-            if marker in title_lower:
-                return True
-        
-        return False
+        return cls._LANGUAGE_RE.search(title) is not None
     
-    def _extract_set(self, title: str) -> str:
+    @classmethod
+    @lru_cache(maxsize=TITLE_CACHE_SIZE)
+    def _extract_set(cls, title: str) -> str:
         """
         Extract set information from the product title.
         
@@ -271,7 +310,7 @@ class FaceToFaceScraper(StoreScraper):
         # Example: "Lightning Bolt [117] [Double Masters 2022] [Foil]"
         
         # Extract all text within brackets
-        all_brackets = re.findall(r'\[([^\]]+)\]', title)
+        all_brackets = cls._BRACKET_RE.findall(title)
         
         if len(all_brackets) >= 2:
             # Second bracket is usually the set name
@@ -286,7 +325,9 @@ class FaceToFaceScraper(StoreScraper):
         
         return "Unknown"
     
-    def _is_foil(self, title: str) -> bool:
+    @classmethod
+    @lru_cache(maxsize=TITLE_CACHE_SIZE)
+    def _is_foil(cls, title: str) -> bool:
         """
         Determine if the card is foil.
         
@@ -305,7 +346,9 @@ class FaceToFaceScraper(StoreScraper):
         # Check for [Foil] indicator
         return '[foil]' in title_lower or '(foil)' in title_lower
     
-    def _clean_card_name(self, title: str) -> str:
+    @classmethod
+    @lru_cache(maxsize=TITLE_CACHE_SIZE)
+    def _clean_card_name(cls, title: str) -> str:
         """
         Clean up the card name by removing set info, foil markers, etc.
         
@@ -315,17 +358,11 @@ class FaceToFaceScraper(StoreScraper):
         Returns:
             The cleaned card name
         """
-        # Remove everything in brackets
-        cleaned = re.sub(r'\[([^\]]+)\]', '', title)
-        
-        # Remove foil indicator
-        cleaned = re.sub(r'\bfoil\b', '', cleaned, flags=re.I)
-        
-        # Remove extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        cleaned = cleaned.strip()
+        # Remove everything in brackets and the foil indicator in a single pass
+        cleaned = cls._CLEAN_RE.sub('', title)
         
-        return cleaned
+        # Remove extra whitespace (split() also drops leading/trailing spaces)
+        return ' '.join(cleaned.split())
     
     def _serialize_offers(self, offers: List[Offer]) -> List[dict]:
         """
@@ -352,12 +389,15 @@ class FaceToFaceScraper(StoreScraper):
             for offer in offers
         ]
     
-    def _deserialize_offers(self, data: List[dict]) -> List[Offer]:
+    def _deserialize_offers(self, data: List[dict], query: Optional[str] = None) -> List[Offer]:
         """
         Deserialize cached data back to Offer objects.
         
         Args:
             data: List of dictionaries
+            query: Optional search query to set on every offer. Cache entries are
+                   shared by queries that differ only in case or spacing, so the
+                   current query replaces the one stored with the entry.
         
         Returns:
             List of Offer objects
@@ -372,7 +412,7 @@ class FaceToFaceScraper(StoreScraper):
                 url=item['url'],
                 foil=item['foil'],
                 availability=item['availability'],
-                query=item.get('query', '')  # Use get() for backward compatibility
+                query=query if query is not None else item.get('query', '')  # Use get() for backward compatibility
             )
             for item in data
         ]
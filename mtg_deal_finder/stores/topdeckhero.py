@@ -6,17 +6,17 @@ a Canadian Magic: The Gathering card store.
 """
 
 import logging
-import re
-import time
-from typing import List
+from typing import List, Optional
 from urllib.parse import quote_plus
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html
 
 from mtg_deal_finder.cards import Card, Offer
 from mtg_deal_finder.stores.base import StoreScraper
-from mtg_deal_finder.utils.caching import load_from_cache, save_to_cache
+from mtg_deal_finder.utils.caching import load_from_cache, load_stale_from_cache, save_to_cache
+from mtg_deal_finder.utils.dom import STREAM_CHUNK_SIZE, class_xpath, parse_html_stream
+from mtg_deal_finder.utils.http import conditional_headers, get_shared_session, get_validators
 from mtg_deal_finder.utils.normalization import card_name_matches_query
 
 
@@ -46,20 +46,33 @@ class TopDeckHeroScraper(StoreScraper):
         'Damaged': 'Damaged',
     }
     
-    def __init__(self, use_cache: bool = True, apply_discount: bool = False):
+    # Compiled XPath expressions locating the parts of a search results page
+    _PRODUCTS_XPATH = etree.XPath(class_xpath('li', 'product', relative=False))
+    _NAME_XPATH = etree.XPath(class_xpath('h4', 'name'))
+    _CATEGORY_XPATH = etree.XPath(class_xpath('span', 'category'))
+    _URL_XPATH = etree.XPath('.//a[@itemprop="url"]')
+    _VARIANTS_XPATH = etree.XPath(class_xpath('div', 'variant-row'))
+    _DESCRIPTION_XPATH = etree.XPath(class_xpath('span', 'variant-description'))
+    _FORM_XPATH = etree.XPath(class_xpath('form', 'add-to-cart-form'))
+    _FOIL_XPATH = etree.XPath(class_xpath('i', 'ss-foil'))
+    
+    def __init__(self, use_cache: bool = True, apply_discount: bool = False,
+                 only_available: bool = False):
         """
-        Initialize the scraper with a requests session.
+        Initialize the scraper with the shared pooled requests session.
         
         Args:
             use_cache: Whether to use caching for search results (default: True)
             apply_discount: Whether to apply the 20% checkout discount (default: False)
+            only_available: Whether to skip out-of-stock variants while parsing (default: False)
         """
-        self.session = requests.Session()
-        # Set a user agent to appear as a regular browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = get_shared_session()
         self.use_cache = use_cache
+        self.only_available = only_available
+        
+        # In-stock-only results are cached apart from full results so that a
+        # later unfiltered search never reads a partial entry
+        self.cache_name = f"{self.STORE_NAME}-instock" if only_available else self.STORE_NAME
         self.apply_discount = apply_discount
         self.discount_rate = 0.20  # 20% discount
     
@@ -79,15 +92,25 @@ class TopDeckHeroScraper(StoreScraper):
             logger.info(f"Searching TopDeckHero for: {card.name}")
             
             # Check cache first
+            stale_entry = None
             if self.use_cache:
-                cached_data = load_from_cache(self.STORE_NAME, card.name)
-                if cached_data:
+                cached_data = load_from_cache(self.cache_name, card.name)
+                if cached_data is not None:
                     logger.info(f"Using cached data for {card.name}")
                     # Convert cached data back to Offer objects
-                    return self._deserialize_offers(cached_data)
+                    return self._deserialize_offers(cached_data, query=card.name)
+                
+                # An expired entry can still be revalidated page by page, so
+                # pages the store reports unchanged aren't downloaded again
+                stale_entry = load_stale_from_cache(self.cache_name, card.name)
             
-            # Collect offers from multiple pages
+            stale_pages = stale_entry["pages"] if stale_entry else []
+            stale_start = 0
+            
+            # Collect offers from multiple pages, along with each page's
+            # validators and offer count for revalidating the cache entry
             all_offers = []
+            pages = []
             
             for page_num in range(1, max_pages + 1):
                 logger.debug(f"Fetching page {page_num} for {card.name}")
@@ -99,31 +122,43 @@ class TopDeckHeroScraper(StoreScraper):
                 if page_num > 1:
                     params['page'] = page_num
                 
-                # Make the request
-                response = self.session.get(self.SEARCH_URL, params=params, timeout=10)
-                response.raise_for_status()
+                stale_page = stale_pages[page_num - 1] if page_num <= len(stale_pages) else None
+                headers = conditional_headers(stale_page) if stale_page else None
                 
-                # Parse HTML response
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # Make the request, streaming the page into the parser as it
+                # downloads instead of buffering the whole body first
+                with self.fetch(self.SEARCH_URL, params=params, headers=headers,
+                                timeout=10, stream=True) as response:
+                    if response.status_code == 304:
+                        # Page unchanged since the entry was saved: reuse its offers
+                        logger.debug(f"Page {page_num} not modified, reusing cached offers")
+                        page_data = stale_entry["data"][stale_start:stale_start + stale_page["count"]]
+                        page_offers = self._deserialize_offers(page_data, query=card.name)
+                        validators = stale_page
+                    else:
+                        response.raise_for_status()
+                        tree = parse_html_stream(response.iter_content(STREAM_CHUNK_SIZE))
+                        
+                        # Extract offers from the page
+                        page_offers = self._parse_search_results(tree, card.name)
+                        validators = get_validators(response)
                 
-                # Extract offers from the page
-                page_offers = self._parse_search_results(soup, card.name)
+                if stale_page:
+                    stale_start += stale_page["count"]
+                pages.append({**validators, 'count': len(page_offers)})
                 
                 if not page_offers:
                     logger.debug(f"No more results on page {page_num}, stopping pagination")
                     break
                 
                 all_offers.extend(page_offers)
-                
-                # Add a small delay between pages to be polite
-                if page_num < max_pages:
-                    time.sleep(0.5)
             
             logger.info(f"Found {len(all_offers)} offer(s) for {card.name}")
             
-            # Save to cache
-            if self.use_cache and all_offers:
-                save_to_cache(self.STORE_NAME, card.name, self._serialize_offers(all_offers))
+            # Save to cache, including empty results so cards a store doesn't
+            # carry aren't searched again on every run
+            if self.use_cache:
+                save_to_cache(self.cache_name, card.name, self._serialize_offers(all_offers), pages=pages)
             
             return all_offers
             
@@ -134,12 +169,12 @@ class TopDeckHeroScraper(StoreScraper):
             logger.error(f"Unexpected error while searching TopDeckHero: {e}")
             return []
     
-    def _parse_search_results(self, soup: BeautifulSoup, card_name: str) -> List[Offer]:
+    def _parse_search_results(self, tree: html.HtmlElement, card_name: str) -> List[Offer]:
         """
         Parse offers from the search results page.
         
         Args:
-            soup: BeautifulSoup object of the search results page
+            tree: lxml root element of the search results page
             card_name: The name of the card being searched
         
         Returns:
@@ -149,36 +184,42 @@ class TopDeckHeroScraper(StoreScraper):
         
         try:
             # Find all product listings
-            products = soup.find_all('li', class_='product')
+            products = self._PRODUCTS_XPATH(tree)
             logger.debug(f"Found {len(products)} product listings on page")
             
             for product in products:
                 try:
                     # Extract basic product info
-                    name_elem = product.find('h4', class_='name')
-                    if not name_elem:
+                    name_elems = self._NAME_XPATH(product)
+                    if not name_elems:
                         continue
                     
-                    product_name = name_elem.get_text(strip=True)
+                    product_name = name_elems[0].text_content().strip()
+                    
+                    # Every variant shares the product's card name, so products
+                    # that don't match the query are rejected before any
+                    # variant is parsed
+                    clean_name = self._clean_card_name(product_name)
+                    if not card_name_matches_query(clean_name, card_name):
+                        logger.debug(f"Rejected product: '{clean_name}' doesn't match query '{card_name}'")
+                        continue
                     
                     # Extract set/category
-                    category_elem = product.find('span', class_='category')
-                    product_set = category_elem.get_text(strip=True) if category_elem else "Unknown"
+                    category_elems = self._CATEGORY_XPATH(product)
+                    product_set = category_elems[0].text_content().strip() if category_elems else "Unknown"
                     
                     # Extract product URL
-                    url_elem = product.find('a', itemprop='url')
-                    product_url = self.BASE_URL + url_elem.get('href') if url_elem else ""
+                    url_elems = self._URL_XPATH(product)
+                    product_url = self.BASE_URL + url_elems[0].get('href', '') if url_elems else ""
                     
                     # Find all variants (different conditions) for this product
-                    variants = product.find_all('div', class_='variant-row')
+                    variants = self._VARIANTS_XPATH(product)
                     
                     for variant in variants:
                         try:
                             offer = self._parse_variant(variant, product_name, product_set, product_url, card_name)
-                            if offer and card_name_matches_query(offer.card, card_name):
+                            if offer:
                                 offers.append(offer)
-                            elif offer:
-                                logger.debug(f"Rejected offer: '{offer.card}' doesn't match query '{card_name}'")
                         except Exception as e:
                             logger.debug(f"Error parsing variant: {e}")
                             continue
@@ -192,13 +233,13 @@ class TopDeckHeroScraper(StoreScraper):
         
         return offers
     
-    def _parse_variant(self, variant: BeautifulSoup, product_name: str, 
+    def _parse_variant(self, variant: html.HtmlElement, product_name: str, 
                       product_set: str, product_url: str, query: str = "") -> Offer:
         """
         Parse a single variant (condition) into an Offer.
         
         Args:
-            variant: BeautifulSoup object of the variant row
+            variant: lxml element of the variant row
             product_name: The product name
             product_set: The product set/category
             product_url: The product URL
@@ -207,32 +248,29 @@ class TopDeckHeroScraper(StoreScraper):
         Returns:
             An Offer object, or None if the variant is not valid
         """
-        # Check if variant is in stock
-        is_available = 'in-stock' in variant.get('class', [])
+        # Check if variant is in stock, skipping it before any other parsing
+        # when only available offers are wanted
+        is_available = 'in-stock' in variant.get('class', '').split()
+        if self.only_available and not is_available:
+            return None
         
         # Extract variant description (condition, language)
-        desc_elem = variant.find('span', class_='variant-description')
-        if not desc_elem:
+        desc_elems = self._DESCRIPTION_XPATH(variant)
+        if not desc_elems:
             return None
         
-        variant_desc = desc_elem.get_text(strip=True)
+        variant_desc = desc_elems[0].text_content().strip()
         
         # Parse condition and language from description
         # Format is typically: "Condition, Language" (e.g., "Near Mint, English")
-        parts = [p.strip() for p in variant_desc.split(',')]
+        condition_raw, has_language, language = variant_desc.partition(',')
         
-        condition = 'Unknown'
-        language = 'English'  # Default to English if not specified
+        # Normalize condition
+        condition_raw = condition_raw.strip()
+        condition = self.CONDITION_MAP.get(condition_raw, condition_raw)
         
-        if len(parts) >= 2:
-            condition_raw = parts[0]
-            language = parts[1]
-            # Normalize condition
-            condition = self.CONDITION_MAP.get(condition_raw, condition_raw)
-        elif len(parts) == 1:
-            # Only condition provided, assume English
-            condition_raw = parts[0]
-            condition = self.CONDITION_MAP.get(condition_raw, condition_raw)
+        # Default to English if only the condition is provided
+        language = language.partition(',')[0].strip() if has_language else 'English'
         
         # Filter out non-English cards
         if language.lower() != 'english':
@@ -240,22 +278,19 @@ class TopDeckHeroScraper(StoreScraper):
             return None
         
         # Extract price from form data-price attribute
-        form = variant.find('form', class_='add-to-cart-form')
-        if not form:
+        forms = self._FORM_XPATH(variant)
+        if not forms:
             return None
         
-        price_str = form.get('data-price', '')
+        price_str = forms[0].get('data-price', '')
         if not price_str:
             return None
         
-        # Parse price - format is typically "CAD$ X.XX"
-        price_match = re.search(r'[\d.]+', price_str)
-        if not price_match:
-            return None
-        
+        # Parse price - format is typically "CAD$ X.XX", so the amount is
+        # whatever follows the last "$" (thousands separators dropped)
         try:
-            price = float(price_match.group())
-        except (ValueError, AttributeError):
+            price = float(price_str.rsplit('$', 1)[-1].replace(',', ''))
+        except ValueError:
             return None
         
         # Apply discount if enabled
@@ -264,7 +299,7 @@ class TopDeckHeroScraper(StoreScraper):
         
         # Determine if foil
         # TopDeckHero uses a foil icon with class 'ss-foil'
-        is_foil = variant.find('i', class_='ss-foil') is not None
+        is_foil = bool(self._FOIL_XPATH(variant))
         
         # Clean up card name
         clean_name = self._clean_card_name(product_name)
@@ -322,12 +357,15 @@ class TopDeckHeroScraper(StoreScraper):
             for offer in offers
         ]
     
-    def _deserialize_offers(self, data: List[dict]) -> List[Offer]:
+    def _deserialize_offers(self, data: List[dict], query: Optional[str] = None) -> List[Offer]:
         """
         Deserialize cached data back to Offer objects.
         
         Args:
             data: List of dictionaries
+            query: Optional search query to set on every offer. Cache entries are
+                   shared by queries that differ only in case or spacing, so the
+                   current query replaces the one stored with the entry.
         
         Returns:
             List of Offer objects
@@ -342,7 +380,7 @@ class TopDeckHeroScraper(StoreScraper):
                 url=item['url'],
                 foil=item['foil'],
                 availability=item['availability'],
-                query=item.get('query', '')  # Use get() for backward compatibility
+                query=query if query is not None else item.get('query', '')  # Use get() for backward compatibility
             )
             for item in data
         ]
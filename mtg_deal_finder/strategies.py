@@ -7,9 +7,15 @@ cheapest non-foil, foil-first-cheapest, blingiest (most expensive foil), etc.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional
 from mtg_deal_finder.cards import Offer
-from mtg_deal_finder.quality import CardQuality, meets_minimum_quality
+from mtg_deal_finder.quality import CardQuality, condition_rank
+
+
+# Key for comparing offers by price in min/max
+_PRICE = attrgetter("price")
 
 
 class SelectionStrategy(ABC):
@@ -20,6 +26,10 @@ class SelectionStrategy(ABC):
     the select method to provide a consistent interface.
     """
     
+    # Strategies only hold their minimum quality; subclasses declare empty
+    # __slots__ so no instance carries a __dict__
+    __slots__ = ('min_quality', '_min_rank')
+    
     def __init__(self, min_quality: Optional[CardQuality] = None):
         """
         Initialize the strategy with optional minimum quality filter.
@@ -28,24 +38,33 @@ class SelectionStrategy(ABC):
             min_quality: Minimum quality level to consider, or None for no restriction
         """
         self.min_quality = min_quality
+        
+        # Minimum quality as a plain int rank, compared against each offer's
+        # condition_rank without going through the enum
+        self._min_rank = int(min_quality) if min_quality is not None else None
     
-    def _filter_by_quality(self, offers: List[Offer]) -> List[Offer]:
+    def _available(self, offers: List[Offer]) -> Iterator[Offer]:
         """
-        Filter offers by minimum quality requirement.
+        Filter offers down to those in stock that meet the minimum quality.
+        
+        Both checks are made in a single pass over the offers, and the quality
+        check is skipped for offers that are out of stock. Offers are yielded
+        lazily so strategies can reduce them without building a list.
         
         Args:
             offers: List of offers to filter
         
         Returns:
-            Filtered list of offers that meet the minimum quality
+            An iterator over the available offers that meet the minimum quality
         """
-        if self.min_quality is None:
-            return offers
+        min_rank = self._min_rank
+        if min_rank is None:
+            return (offer for offer in offers if offer.availability)
         
-        return [
-            offer for offer in offers 
-            if meets_minimum_quality(offer.condition, self.min_quality)
-        ]
+        return (
+            offer for offer in offers
+            if offer.availability and condition_rank(offer.condition) >= min_rank
+        )
     
     @abstractmethod
     def select(self, offers: List[Offer]) -> Optional[Offer]:
@@ -60,6 +79,20 @@ class SelectionStrategy(ABC):
         """
         pass
     
+    def select_many(self, offers_by_card: Dict[str, List[Offer]]) -> Dict[str, Optional[Offer]]:
+        """
+        Select the best offer for each of several cards in one call.
+        
+        Args:
+            offers_by_card: A dictionary mapping card names to their offers
+        
+        Returns:
+            A dictionary mapping each card name to its selected Offer, or None
+            if no suitable offer is found, in the order the cards were given
+        """
+        select = self.select
+        return {name: select(offers) for name, offers in offers_by_card.items()}
+    
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -76,6 +109,8 @@ class CheapestStrategy(SelectionStrategy):
     Strategy that selects the cheapest available offer regardless of condition or foil status.
     """
     
+    __slots__ = ()
+    
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
         Select the cheapest offer from the list.
@@ -89,16 +124,7 @@ class CheapestStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
-        
-        # Filter only available offers
-        available_offers = [o for o in quality_filtered if o.availability]
-        
-        if not available_offers:
-            return None
-        
-        return min(available_offers, key=lambda x: x.price)
+        return min(self._available(offers), key=_PRICE, default=None)
     
     def get_name(self) -> str:
         return "Cheapest"
@@ -109,6 +135,8 @@ class CheapestFoilStrategy(SelectionStrategy):
     Strategy that selects the cheapest foil card.
     """
     
+    __slots__ = ()
+    
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
         Select the cheapest foil offer from the list.
@@ -122,16 +150,10 @@ class CheapestFoilStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
+        # Reduce the available foil offers as they are filtered
+        foil_offers = (o for o in self._available(offers) if o.foil)
         
-        # Filter for available foil offers
-        foil_offers = [o for o in quality_filtered if o.foil and o.availability]
-        
-        if not foil_offers:
-            return None
-        
-        return min(foil_offers, key=lambda x: x.price)
+        return min(foil_offers, key=_PRICE, default=None)
     
     def get_name(self) -> str:
         return "Cheapest Foil"
@@ -142,6 +164,8 @@ class CheapestNonFoilStrategy(SelectionStrategy):
     Strategy that selects the cheapest non-foil card.
     """
     
+    __slots__ = ()
+    
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
         Select the cheapest non-foil offer from the list.
@@ -155,16 +179,10 @@ class CheapestNonFoilStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
-        
-        # Filter for available non-foil offers
-        non_foil_offers = [o for o in quality_filtered if not o.foil and o.availability]
+        # Reduce the available non-foil offers as they are filtered
+        non_foil_offers = (o for o in self._available(offers) if not o.foil)
         
-        if not non_foil_offers:
-            return None
-        
-        return min(non_foil_offers, key=lambda x: x.price)
+        return min(non_foil_offers, key=_PRICE, default=None)
     
     def get_name(self) -> str:
         return "Cheapest Non-Foil"
@@ -175,6 +193,8 @@ class BlingiestStrategy(SelectionStrategy):
     Strategy that selects the most expensive foil card (for "bling" factor).
     """
     
+    __slots__ = ()
+    
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
         Select the most expensive foil offer from the list.
@@ -188,16 +208,10 @@ class BlingiestStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
+        # Reduce the available foil offers as they are filtered
+        foil_offers = (o for o in self._available(offers) if o.foil)
         
-        # Filter for available foil offers
-        foil_offers = [o for o in quality_filtered if o.foil and o.availability]
-        
-        if not foil_offers:
-            return None
-        
-        return max(foil_offers, key=lambda x: x.price)
+        return max(foil_offers, key=_PRICE, default=None)
     
     def get_name(self) -> str:
         return "Blingiest (Most Expensive Foil)"
@@ -208,7 +222,7 @@ class BestConditionStrategy(SelectionStrategy):
     Strategy that selects the cheapest offer in Near Mint condition.
     """
     
-    NEAR_MINT_CONDITIONS = ["Near Mint", "NM", "Mint", "M"]
+    __slots__ = ()
     
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
@@ -223,22 +237,18 @@ class BestConditionStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
-        
-        # Filter for available Near Mint offers
-        nm_offers = [
-            o for o in quality_filtered
-            if o.availability and any(
-                nm_cond.lower() in o.condition.lower() 
-                for nm_cond in self.NEAR_MINT_CONDITIONS
-            )
-        ]
+        # Near Mint is at least as strict as any lower minimum quality, so the
+        # stricter of the two covers both in one memoized check per offer,
+        # made only after the cheap availability test
+        threshold = max(self._min_rank or 0, int(CardQuality.NEAR_MINT))
         
-        if not nm_offers:
-            return None
+        # Filter for available Near Mint (or Mint) offers
+        nm_offers = (
+            o for o in offers
+            if o.availability and condition_rank(o.condition) >= threshold
+        )
         
-        return min(nm_offers, key=lambda x: x.price)
+        return min(nm_offers, key=_PRICE, default=None)
     
     def get_name(self) -> str:
         return "Best Condition (Near Mint)"
@@ -250,6 +260,8 @@ class FoilFirstCheapestStrategy(SelectionStrategy):
     otherwise falls back to the cheapest non-foil.
     """
     
+    __slots__ = ()
+    
     def select(self, offers: List[Offer]) -> Optional[Offer]:
         """
         Select the cheapest foil offer if available, otherwise the cheapest non-foil.
@@ -264,24 +276,20 @@ class FoilFirstCheapestStrategy(SelectionStrategy):
         if not offers:
             return None
         
-        # Filter by quality first
-        quality_filtered = self._filter_by_quality(offers)
+        # Track the cheapest foil and cheapest non-foil in a single pass. Once a
+        # foil is found the non-foil fallback can no longer be picked
+        best_foil = None
+        best_non_foil = None
         
-        # Filter only available offers
-        available_offers = [o for o in quality_filtered if o.availability]
+        for offer in self._available(offers):
+            if offer.foil:
+                if best_foil is None or offer.price < best_foil.price:
+                    best_foil = offer
+            elif best_foil is None and (best_non_foil is None or offer.price < best_non_foil.price):
+                best_non_foil = offer
         
-        if not available_offers:
-            return None
-        
-        # Try to find cheapest foil first
-        foil_offers = [o for o in available_offers if o.foil]
-        if foil_offers:
-            return min(foil_offers, key=lambda x: x.price)
-        
-        # Fall back to cheapest non-foil
-        non_foil_offers = [o for o in available_offers if not o.foil]
-        if non_foil_offers:
-            return min(non_foil_offers, key=lambda x: x.price)
+        # Prefer the cheapest foil, falling back to the cheapest non-foil
+        return best_foil if best_foil is not None else best_non_foil
     
     def get_name(self) -> str:
         return "Foil First, Cheapest"
@@ -298,10 +306,14 @@ AVAILABLE_STRATEGIES = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_strategy(strategy_name: str, min_quality: Optional[CardQuality] = None) -> SelectionStrategy:
     """
     Get a selection strategy by name.
     
+    Strategies hold no state besides their minimum quality, so one instance is
+    built per name and quality and returned again on later calls.
+    
     Args:
         strategy_name: The name of the strategy (e.g., "cheapest", "cheapest-foil")
         min_quality: Minimum quality level to apply to all strategies, or None for no restriction
@@ -6,21 +6,58 @@ redundant API calls and web scraping operations, improving performance
 and reducing load on store servers.
 """
 
+import hashlib
 import json
 import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib json module
+    orjson = None
 
 
 # Default cache directory
 CACHE_DIR = Path.home() / ".mtg_deal_finder" / "cache"
 
+# How long, in hours, after expiring an entry is kept, so that entries saved
+# with page validators can still be revalidated with the store
+REVALIDATE_TTL_HOURS = 24 * 7
+
+# Maximum number of fresh entries kept in memory in front of the cache files
+MEMORY_CACHE_SIZE = 512
+
+# Fresh entries by cache path, as (expiry time, data), least recently used
+# first. Shared by all searching threads, so guarded by a lock
+_memory_cache: "OrderedDict[Path, Tuple[float, Any]]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+# Characters dropped from the store part of cache file names: anything but
+# letters, digits, underscores and hyphens
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w-]')
+
+# Cache directory already created by this process, so it is only created once
+_created_cache_dir: Optional[Path] = None
+
 
 def get_cache_path(store_name: str, card_name: str) -> Path:
     """
     Get the cache file path for a specific store and card combination.
     
+    Card names are compared case-insensitively and with runs of whitespace
+    collapsed, so "Lightning Bolt" and "lightning  bolt" share one cache entry.
+    The file is named after the store and a hash of the normalized card name,
+    so names differing only in punctuation never share a file and every
+    name maps to a short, filesystem-safe file name.
+    
     Args:
         store_name: The name of the store
         card_name: The name of the card
@@ -28,17 +65,66 @@ def get_cache_path(store_name: str, card_name: str) -> Path:
     Returns:
         A Path object representing the cache file location
     """
-    # Create cache directory if it doesn't exist
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Normalize the card name so equivalent queries map to the same file
+    card_key = " ".join(card_name.split()).lower()
     
-    # Create a safe filename
-    safe_filename = f"{store_name}_{card_name}".replace(" ", "_").replace("/", "_")
-    safe_filename = "".join(c for c in safe_filename if c.isalnum() or c in ("_", "-"))
+    # Keep the store name as a readable prefix, which clear_cache filters on
+    store_key = _UNSAFE_FILENAME_RE.sub("", store_name.replace(" ", "_"))
+    card_hash = hashlib.blake2b(card_key.encode("utf-8"), digest_size=16).hexdigest()
     
-    return CACHE_DIR / f"{safe_filename}.json"
+    return CACHE_DIR / f"{store_key}_{card_hash}.json"
 
 
-def save_to_cache(store_name: str, card_name: str, data: Any, ttl_hours: int = 24) -> None:
+def _ensure_cache_dir() -> None:
+    """Create the cache directory if it doesn't exist, once per directory."""
+    global _created_cache_dir
+    
+    if _created_cache_dir != CACHE_DIR:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _created_cache_dir = CACHE_DIR
+
+
+def _remember(cache_path: Path, expires_at: float, data: Any) -> None:
+    """Keep a fresh entry in the in-memory cache, evicting the least recently used."""
+    with _memory_cache_lock:
+        _memory_cache[cache_path] = (expires_at, data)
+        _memory_cache.move_to_end(cache_path)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _recall(cache_path: Path) -> Optional[Any]:
+    """Get an entry's data from the in-memory cache if it is there and fresh."""
+    with _memory_cache_lock:
+        cached = _memory_cache.get(cache_path)
+        if cached is None:
+            return None
+        
+        expires_at, data = cached
+        if time.time() >= expires_at:
+            del _memory_cache[cache_path]
+            return None
+        
+        _memory_cache.move_to_end(cache_path)
+        return data
+
+
+def _encode_entry(cache_entry: Dict[str, Any]) -> bytes:
+    """Serialize a cache entry to compact JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(cache_entry)
+    return json.dumps(cache_entry, separators=(',', ':')).encode('utf-8')
+
+
+def _decode_entry(raw: bytes) -> Dict[str, Any]:
+    """Parse a cache entry from JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def save_to_cache(store_name: str, card_name: str, data: Any, ttl_hours: int = 24,
+                  pages: Optional[List[Dict[str, Any]]] = None) -> None:
     """
     Save search results to cache.
     
@@ -47,6 +133,14 @@ def save_to_cache(store_name: str, card_name: str, data: Any, ttl_hours: int = 2
         card_name: The name of the card
         data: The data to cache (must be JSON-serializable)
         ttl_hours: Time-to-live in hours (default: 24)
+        pages: Optional HTTP validators (ETag, Last-Modified) and offer count of
+               each result page, kept so the entry can be revalidated once expired
+    
+    The file's modification time is set to the entry's expiry time, so that
+    load_from_cache can tell whether it is still fresh from a single stat.
+    The entry is written to a temporary file that then replaces the cache
+    file in one step, so an interrupted write never leaves a truncated entry
+    and concurrent writers of the same entry don't interleave.
     """
     cache_path = get_cache_path(store_name, card_name)
     
@@ -55,10 +149,26 @@ def save_to_cache(store_name: str, card_name: str, data: Any, ttl_hours: int = 2
         "ttl_hours": ttl_hours,
         "data": data
     }
+    if pages is not None:
+        cache_entry["pages"] = pages
     
     try:
-        with open(cache_path, 'w') as f:
-            json.dump(cache_entry, f, indent=2)
+        _ensure_cache_dir()
+        expires_at = time.time() + ttl_hours * 3600
+        
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_encode_entry(cache_entry))
+            os.utime(tmp_path, (expires_at, expires_at))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            # Don't leave the partial temporary file behind
+            with suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        
+        _remember(cache_path, expires_at, data)
     except Exception as e:
         # Log error but don't fail the operation
         print(f"Warning: Failed to save cache: {e}")
@@ -68,8 +178,13 @@ def load_from_cache(store_name: str, card_name: str) -> Optional[Any]:
     """
     Load search results from cache if available and not expired.
     
-    If the cache exists but is expired (older than the TTL), the expired
-    cache file is automatically deleted to prevent stale data accumulation.
+    Entries loaded or saved earlier in the process are served from memory
+    without touching the file. Otherwise freshness is read from the file's
+    modification time, which save_to_cache
+    sets to the entry's expiry time, so expired entries are never opened or
+    parsed. Entries that expired more than REVALIDATE_TTL_HOURS ago are
+    deleted to prevent stale data accumulation; more recently expired ones
+    are kept so load_stale_from_cache can still return them.
     
     Args:
         store_name: The name of the store
@@ -80,25 +195,38 @@ def load_from_cache(store_name: str, card_name: str) -> Optional[Any]:
     """
     cache_path = get_cache_path(store_name, card_name)
     
-    if not cache_path.exists():
+    data = _recall(cache_path)
+    if data is not None:
+        return data
+    
+    try:
+        expires_at = cache_path.stat().st_mtime
+    except OSError:
+        return None
+    
+    expired_for = time.time() - expires_at
+    
+    # Check if cache is expired, before reading the file at all
+    if expired_for > 0:
+        if expired_for > REVALIDATE_TTL_HOURS * 3600:
+            # Too old to revalidate either - delete the file
+            try:
+                cache_path.unlink()
+            except Exception as delete_error:
+                print(f"Warning: Failed to delete expired cache {cache_path}: {delete_error}")
         return None
     
     try:
-        with open(cache_path, 'r') as f:
-            cache_entry = json.load(f)
+        with open(cache_path, 'rb') as f:
+            cache_entry = _decode_entry(f.read())
         
-        # Check if cache is expired
+        # Second guard on the TTL recorded in the entry itself
         timestamp = datetime.fromisoformat(cache_entry["timestamp"])
         ttl = timedelta(hours=cache_entry.get("ttl_hours", 24))
-        
         if datetime.now() - timestamp > ttl:
-            # Cache expired - delete the file
-            try:
-                cache_path.unlink()
-            except Exception as delete_error:
-                print(f"Warning: Failed to delete expired cache {cache_path}: {delete_error}")
             return None
         
+        _remember(cache_path, expires_at, cache_entry["data"])
         return cache_entry["data"]
     
     except Exception as e:
@@ -107,23 +235,65 @@ def load_from_cache(store_name: str, card_name: str) -> Optional[Any]:
         return None
 
 
+def load_stale_from_cache(store_name: str, card_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Load an expired cache entry that can be revalidated with the store.
+    
+    Args:
+        store_name: The name of the store
+        card_name: The name of the card
+    
+    Returns:
+        A dictionary with the cached "data" and the "pages" validators it was
+        saved with, or None if there is no such entry
+    """
+    cache_path = get_cache_path(store_name, card_name)
+    
+    if not cache_path.exists():
+        return None
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cache_entry = _decode_entry(f.read())
+        
+        if "pages" not in cache_entry:
+            return None
+        
+        return {"data": cache_entry["data"], "pages": cache_entry["pages"]}
+    
+    except Exception as e:
+        # Log error but don't fail the operation
+        print(f"Warning: Failed to load cache: {e}")
+        return None
+
+
 def clear_cache(store_name: Optional[str] = None) -> int:
     """
     Clear cached data.
     
     Args:
-        store_name: If provided, only clear cache for this store.
-                   If None, clear all cache.
+        store_name: If provided, only clear cache for this store, including
+                   its in-stock-only entries. If None, clear all cache.
     
     Returns:
         Number of cache files deleted
     """
+    prefixes = (f"{store_name}_", f"{store_name}-")
+    
+    # Forget the matching in-memory entries too
+    with _memory_cache_lock:
+        if store_name is None:
+            _memory_cache.clear()
+        else:
+            for cache_path in [p for p in _memory_cache if p.name.startswith(prefixes)]:
+                del _memory_cache[cache_path]
+    
     if not CACHE_DIR.exists():
         return 0
     
     count = 0
     for cache_file in CACHE_DIR.glob("*.json"):
-        if store_name is None or cache_file.name.startswith(f"{store_name}_"):
+        if store_name is None or cache_file.name.startswith(prefixes):
             try:
                 cache_file.unlink()
                 count += 1
@@ -0,0 +1,92 @@
+"""
+HTML helpers shared by the store scrapers that parse search result pages.
+
+The scrapers parse pages with lxml, which keeps the document tree in C and is
+much faster than building a BeautifulSoup tree of Python objects.
+"""
+
+from typing import Iterable
+
+from lxml import html
+
+
+# Encoding assumed for store pages, which are served as UTF-8
+DEFAULT_ENCODING = "utf-8"
+
+# Size, in bytes, of the chunks a streamed page is fed to the parser in
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def class_xpath(tag: str, class_name: str, relative: bool = True) -> str:
+    """
+    Build an XPath expression matching elements that carry a CSS class.
+    
+    The class is matched as a whole token of the class attribute, like the CSS
+    selector ``tag.class_name``: "product" matches class="product clearfix" but
+    not class="product-image".
+    
+    Args:
+        tag: The element tag name (e.g., "li")
+        class_name: The CSS class the element must have
+        relative: If True, search below the context element (default: True);
+                  otherwise search the whole document
+    
+    Returns:
+        The XPath expression as a string
+    """
+    prefix = ".//" if relative else "//"
+    return f"{prefix}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def parse_html(content: bytes, encoding: str = DEFAULT_ENCODING) -> html.HtmlElement:
+    """
+    Parse an HTML page into an lxml element tree.
+    
+    The raw bytes are decoded by lxml itself rather than by requests first.
+    The encoding is given explicitly because lxml would otherwise fall back to
+    Latin-1 for pages that don't declare a charset in a <meta> tag.
+    
+    Args:
+        content: The raw HTML bytes of the page
+        encoding: The character encoding of the page (default: "utf-8")
+    
+    Returns:
+        The root element of the document. An empty page yields an empty
+        <html> element instead of raising.
+    """
+    if not content or not content.strip():
+        return html.Element("html")
+    
+    # A parser per call: lxml parser objects must not be shared between the
+    # threads that run searches concurrently
+    return html.document_fromstring(content, parser=html.HTMLParser(encoding=encoding))
+
+
+def parse_html_stream(chunks: Iterable[bytes], encoding: str = DEFAULT_ENCODING) -> html.HtmlElement:
+    """
+    Parse an HTML page into an lxml element tree as its bytes arrive.
+    
+    Each chunk is fed to lxml's incremental parser as soon as it is received,
+    so parsing overlaps the download and the whole body is never buffered
+    as one bytes object next to the tree.
+    
+    Args:
+        chunks: The raw HTML bytes of the page, in order (e.g., from
+                ``response.iter_content``)
+        encoding: The character encoding of the page (default: "utf-8")
+    
+    Returns:
+        The root element of the document. An empty page yields an empty
+        <html> element instead of raising.
+    """
+    parser = html.HTMLParser(encoding=encoding)
+    received = False
+    
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            received = True
+    
+    if not received:
+        return html.Element("html")
+    return parser.close()
@@ -0,0 +1,169 @@
+"""
+HTTP helpers shared by the store scrapers.
+
+This module builds the requests sessions used by the scrapers so that every
+store gets the same connection pooling, retry policy, and browser headers.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# User agent sent with every request so we appear as a regular browser
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Maximum number of pooled keep-alive connections per host
+POOL_MAXSIZE = 50
+
+# Response statuses that are retried: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Base delay, in seconds, of the exponential backoff between retries
+RETRY_BACKOFF = 0.5
+
+# Longest pause, in seconds, that a store's rate-limit headers can impose
+# between two requests
+MAX_RATE_LIMIT_DELAY = 30.0
+
+# X-RateLimit-Reset values above this are Unix timestamps rather than seconds
+# from now
+_RESET_EPOCH_THRESHOLD = 1_000_000_000
+
+# Session shared by every scraper, created on first use
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE, retries: int = 3) -> requests.Session:
+    """
+    Create a requests session with keep-alive connection pooling and retries.
+    
+    Reusing pooled connections avoids a new TCP and TLS handshake for every
+    request made to the same store. Connection errors and the statuses in
+    RETRY_STATUSES are retried with exponential backoff, honouring any
+    Retry-After header the store sends.
+    
+    Args:
+        pool_maxsize: Maximum number of pooled connections per host (default: 50)
+        retries: Number of times a failed request is retried (default: 3)
+    
+    Returns:
+        A configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the process-wide requests session shared by all scrapers.
+    
+    Scrapers created per search, per thread, or per Streamlit rerun all reuse
+    the same pool of keep-alive connections instead of each opening their own.
+    The session is created on first use and is safe to share between threads
+    for plain GET requests.
+    
+    Returns:
+        The shared requests.Session
+    """
+    global _shared_session
+    
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def get_validators(response: requests.Response) -> Dict[str, Any]:
+    """
+    Get the cache validators a store sent with a response.
+    
+    Args:
+        response: The response to a GET request
+    
+    Returns:
+        A dictionary with the response's "etag" and "last_modified" headers,
+        either of which is None when the store didn't send it
+    """
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def conditional_headers(validators: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build the headers of a conditional GET from saved cache validators.
+    
+    A store that supports them answers with 304 Not Modified and no body when
+    the page hasn't changed since the validators were saved.
+    
+    Args:
+        validators: A dictionary as returned by get_validators
+    
+    Returns:
+        The If-None-Match and If-Modified-Since headers to send, if any
+    """
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def rate_limit_delay(response: requests.Response) -> float:
+    """
+    Get the spacing between requests that a store's rate-limit headers ask for.
+    
+    The requests left in the current window (X-RateLimit-Remaining) are spread
+    evenly over the time until it resets (X-RateLimit-Reset), which stores send
+    either as seconds from now or as a Unix timestamp.
+    
+    Args:
+        response: The store's latest response
+    
+    Returns:
+        The delay in seconds to leave before the next request, capped at
+        MAX_RATE_LIMIT_DELAY. 0.0 when the store sends no usable headers.
+    """
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    reset = response.headers.get('X-RateLimit-Reset')
+    if remaining is None or reset is None:
+        return 0.0
+    
+    try:
+        remaining = int(remaining)
+        reset = float(reset)
+    except ValueError:
+        return 0.0
+    
+    reset_in = reset - time.time() if reset > _RESET_EPOCH_THRESHOLD else reset
+    if reset_in <= 0:
+        return 0.0
+    
+    return min(reset_in / max(remaining, 1), MAX_RATE_LIMIT_DELAY)
@@ -7,9 +7,34 @@ comparisons.
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
 
+__all__ = [
+    'normalize_card_name',
+    'normalize_set_code',
+    'normalize_condition',
+    'normalize_price',
+    'card_name_matches_query',
+    'DESCRIPTOR_WORDS',
+]
 
+# Number of distinct strings whose normalized form is memoized. Store results
+# repeat the same handful of card names and conditions across a whole run
+_NORMALIZE_CACHE_SIZE = 4096
+
+# Runs of whitespace collapsed to a single space in card names
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Anything that isn't part of a number, stripped from price strings
+_NON_PRICE_RE = re.compile(r'[^\d.]')
+
+# Words of a card name, without surrounding punctuation such as commas,
+# brackets, or "//" (apostrophes and hyphens stay part of the word)
+_WORD_RE = re.compile(r"[\w'-]+")
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_card_name(name: str) -> str:
     """
     Normalize a card name for consistent comparison.
@@ -34,7 +59,7 @@ def normalize_card_name(name: str) -> str:
         return ""
     
     # Strip whitespace and normalize multiple spaces
-    normalized = re.sub(r'\s+', ' ', name.strip())
+    normalized = _WHITESPACE_RE.sub(' ', name.strip())
     
     return normalized
 
@@ -62,6 +87,7 @@ def normalize_set_code(set_code: Optional[str]) -> Optional[str]:
     return normalized if normalized else None
 
 
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_condition(condition: str) -> str:
     """
     Normalize a card condition string.
@@ -84,32 +110,42 @@ def normalize_condition(condition: str) -> str:
     if not condition:
         return "NM"  # Default to Near Mint
     
-    condition_upper = condition.strip().upper()
-    
-    # Map common variations to standard abbreviations
-    condition_map = {
-        "NEAR MINT": "NM",
-        "NEARMINT": "NM",
-        "NM": "NM",
-        "MINT": "NM",
-        "LIGHTLY PLAYED": "LP",
-        "LIGHTLYPLAYED": "LP",
-        "LP": "LP",
-        "LIGHT PLAY": "LP",
-        "MODERATELY PLAYED": "MP",
-        "MODERATELYPLAYED": "MP",
-        "MP": "MP",
-        "MODERATE PLAY": "MP",
-        "HEAVILY PLAYED": "HP",
-        "HEAVILYPLAYED": "HP",
-        "HP": "HP",
-        "HEAVY PLAY": "HP",
-        "DAMAGED": "DMG",
-        "DMG": "DMG",
-        "POOR": "DMG",
-    }
-    
-    return condition_map.get(condition_upper, condition_upper)
+    condition = condition.strip()
+    
+    # Already a standard abbreviation: nothing to map
+    if condition in _CANONICAL_CONDITIONS:
+        return condition
+    
+    condition_upper = condition.upper()
+    return _CONDITION_MAP.get(condition_upper, condition_upper)
+
+
+# Common condition variations (uppercased) mapped to standard abbreviations,
+# built once at import time so lookups are a single dict access
+_CONDITION_MAP = {
+    "NEAR MINT": "NM",
+    "NEARMINT": "NM",
+    "NM": "NM",
+    "MINT": "NM",
+    "LIGHTLY PLAYED": "LP",
+    "LIGHTLYPLAYED": "LP",
+    "LP": "LP",
+    "LIGHT PLAY": "LP",
+    "MODERATELY PLAYED": "MP",
+    "MODERATELYPLAYED": "MP",
+    "MP": "MP",
+    "MODERATE PLAY": "MP",
+    "HEAVILY PLAYED": "HP",
+    "HEAVILYPLAYED": "HP",
+    "HP": "HP",
+    "HEAVY PLAY": "HP",
+    "DAMAGED": "DMG",
+    "DMG": "DMG",
+    "POOR": "DMG",
+}
+
+# The standard abbreviations themselves, returned as they are
+_CANONICAL_CONDITIONS = frozenset(_CONDITION_MAP.values())
 
 
 # Common words that are typically descriptors, not part of card names
@@ -141,7 +177,7 @@ def normalize_price(price: str) -> float:
         raise ValueError("Price cannot be empty")
     
     # Remove currency symbols and common text
-    cleaned = re.sub(r'[^\d.]', '', str(price))
+    cleaned = _NON_PRICE_RE.sub('', price if isinstance(price, str) else str(price))
     
     try:
         return float(cleaned)
@@ -149,14 +185,35 @@ def normalize_price(price: str) -> float:
         raise ValueError(f"Cannot parse price: {price}")
 
 
+@lru_cache(maxsize=1024)
+def _compile_query(query: str) -> Tuple[FrozenSet[str], str]:
+    """
+    Prepare a search query for matching against many card names.
+    
+    Memoized, since every result of a search is checked against the same query.
+    
+    Args:
+        query: The original search query (card name)
+    
+    Returns:
+        A tuple of the query's core words (descriptor words removed) and the
+        whole normalized, lowercased query
+    """
+    normalized_query = normalize_card_name(query).lower()
+    core_words = frozenset(
+        word for word in _WORD_RE.findall(normalized_query) if word not in DESCRIPTOR_WORDS
+    )
+    return core_words, normalized_query
+
+
 def card_name_matches_query(card_name: str, query: str) -> bool:
     """
     Check if a card name matches the search query.
     
     This function validates that the card name from a store result actually matches
     the original search query. It uses case-insensitive comparison and checks if
-    all words from the query appear in the card name, filtering out common words
-    that might be descriptors rather than part of the card name.
+    all words from the query appear as whole words in the card name, filtering
+    out common words that might be descriptors rather than part of the card name.
     
     Args:
         card_name: The card name from the store result
@@ -178,25 +235,16 @@ def card_name_matches_query(card_name: str, query: str) -> bool:
     if not card_name or not query:
         return False
     
-    # Normalize both strings for comparison
+    # Core query words, without descriptor words - these are optional matches
+    core_query_words, normalized_query = _compile_query(query)
     normalized_card = normalize_card_name(card_name).lower()
-    normalized_query = normalize_card_name(query).lower()
-    
-    # Split query into words
-    query_words = normalized_query.split()
-    
-    # Filter out descriptor words from the query - these are optional matches
-    core_query_words = [word for word in query_words if word not in DESCRIPTOR_WORDS]
     
     # If query has no core words after filtering, require exact match
     # This handles edge cases like searching for just "foil" or "promo" alone
     if not core_query_words:
         return normalized_query == normalized_card
     
-    # Check if all core query words appear in the card name
+    # Check if all core query words appear as words of the card name
     # This handles cases where card names have additional text (e.g., "Lightning Bolt - Foil")
-    for word in core_query_words:
-        if word not in normalized_card:
-            return False
-    
-    return True
+    # without letting "bolt" match "Thunderbolt"
+    return core_query_words.issubset(_WORD_RE.findall(normalized_card))
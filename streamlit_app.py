@@ -19,12 +19,61 @@ from mtg_deal_finder.main import (
     parse_card_line,
     search_all_stores,
     select_best_offers,
-    setup_logging,
-    deduplicate_cards
+    setup_logging
 )
 from mtg_deal_finder.strategies import AVAILABLE_STRATEGIES
+from mtg_deal_finder.compare import calculate_total_cost
 from mtg_deal_finder.quality import CardQuality, QUALITY_OPTIONS
-from mtg_deal_finder.output import create_dataframe
+from mtg_deal_finder.output import (
+    STREAMING_EXPORT_THRESHOLD,
+    build_selected_index,
+    create_dataframe,
+    create_sorted_dataframe,
+    write_excel,
+    write_excel_streaming
+)
+
+
+# Store display names mapped to the store names accepted by search_all_stores
+STORE_OPTIONS = {
+    "FaceToFaceGames": "facetoface",
+    "TopDeckHero": "topdeckhero",
+    "TopDeckBoucherville": "topdeckboucherville",
+    "TopDeckJoliette": "topdeckjoliette",
+    "MTGJeuxJubes": "mtgjeuxjubes"
+}
+STORE_NAMES = list(STORE_OPTIONS)
+
+# Stores that offer the TopDeck 20% discount at checkout
+TOPDECK_STORES = ("TopDeckHero", "TopDeckBoucherville", "TopDeckJoliette")
+
+# Sidebar labels for each selection strategy
+STRATEGY_DISPLAY_NAMES = {
+    "cheapest": "Cheapest (any condition, any foiling)",
+    "cheapest-foil": "Cheapest Foil",
+    "cheapest-nonfoil": "Cheapest Non-Foil",
+    "foil-first-cheapest": "Foil First (prefer foil, fallback to non-foil)",
+    "best-condition": "Best Condition (cheapest Near Mint)",
+    "blingiest": "Blingiest (most expensive foil)"
+}
+STRATEGY_NAMES = list(STRATEGY_DISPLAY_NAMES)
+
+# Sidebar labels for each minimum quality choice
+QUALITY_DISPLAY_NAMES = {
+    "none": "No restriction (any condition)",
+    "mint": "Mint (M)",
+    "nm": "Near Mint (NM)",
+    "lp": "Lightly Played (LP)",
+    "mp": "Moderately Played (MP)",
+    "played": "Played (P)",
+    "hp": "Heavily Played (HP)",
+    "damaged": "Damaged"
+}
+QUALITY_NAMES = list(QUALITY_DISPLAY_NAMES)
+
+
+# Session state key holding the results of the last search
+RESULTS_KEY = "results"
 
 
 # Configure page
@@ -36,29 +85,38 @@ st.set_page_config(
 )
 
 
+@st.cache_data(max_entries=128, show_spinner=False)
 def parse_card_input(card_text: str, ignore_set: bool = True) -> List[Card]:
     """
     Parse card input from text area.
     
+    Results are cached per (card_text, ignore_set), so reruns with an
+    unchanged card list skip re-parsing it.
+    
     Args:
         card_text: Multi-line string with one card per line
         ignore_set: If True, set information is discarded (default: True)
     
     Returns:
-        List of Card objects, deduplicated if ignore_set is True
+        List of deduplicated Card objects
     """
-    cards = []
-    for line in card_text.strip().split('\n'):
-        if line.strip():
-            card = parse_card_line(line, ignore_set=ignore_set)
-            if card:
-                cards.append(card)
-    
-    # Deduplicate cards if ignore_set is True
-    if ignore_set:
-        cards = deduplicate_cards(cards)
-    
-    return cards
+    # Merge repeated lines as they are parsed so each card is only searched
+    # for once, the same way deduplicate_cards would
+    card_dict = {}
+    for line in card_text.splitlines():
+        if not line.strip():
+            continue
+        card = parse_card_line(line, ignore_set=ignore_set)
+        if not card:
+            continue
+        key = (card.key, card.set)
+        existing = card_dict.get(key)
+        if existing:
+            existing.qty += card.qty
+        else:
+            card_dict[key] = card
+    
+    return list(card_dict.values())
 
 
 def create_excel_download(offers: List[Offer], selected_offers: List[Offer] = None) -> bytes:
@@ -72,20 +130,66 @@ def create_excel_download(offers: List[Offer], selected_offers: List[Offer] = No
     Returns:
         Bytes of Excel file
     """
-    df = create_dataframe(offers, selected_offers)
-    
-    # Sort by Query, then Selected (selected first), then Price
-    if not df.empty:
-        df = df.sort_values(by=["Query", "Selected", "Price"], ascending=[True, False, True])
+    selected_index = build_selected_index(selected_offers)
     
-    # Write to bytes buffer
+    # Write to bytes buffer, streaming large offer lists row by row instead of
+    # building the whole table as a DataFrame first
     buffer = io.BytesIO()
-    df.to_excel(buffer, index=False, engine='openpyxl')
+    if len(offers) > STREAMING_EXPORT_THRESHOLD:
+        write_excel_streaming(offers, buffer, selected_index)
+    else:
+        df = create_sorted_dataframe(offers, selected_index=selected_index)
+        write_excel(df, buffer)
     buffer.seek(0)
     
     return buffer.getvalue()
 
 
+def show_results(results: Dict) -> None:
+    """
+    Display the results of the last search.
+    
+    Args:
+        results: The results dictionary saved in st.session_state by main
+    """
+    st.header("✨ Results")
+    
+    # Summary metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Offers Found", results["total_offers"])
+    with col2:
+        st.metric("Cards with Offers", results["selected_count"])
+    with col3:
+        st.metric("Total Cost", f"${results['total_cost']:.2f}")
+    
+    # Results table (showing only selected offers for UI)
+    st.subheader("Best Deals (Selected)")
+    
+    # Make URLs clickable
+    st.dataframe(
+        results["df"],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "URL": st.column_config.LinkColumn("URL"),
+            "Price": st.column_config.NumberColumn("Price", format="$%.2f"),
+            "Foil": st.column_config.CheckboxColumn("Foil")
+        }
+    )
+    
+    # Download button
+    st.subheader("📥 Download Results")
+    st.info(f"The Excel file will contain all {results['total_offers']} offers with selected offers marked with a ✓")
+    st.download_button(
+        label="Download Excel File (All Offers)",
+        data=results["excel_data"],
+        file_name="mtg_deal_finder_results.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True
+    )
+
+
 def main():
     """Main Streamlit application."""
     
@@ -106,24 +210,15 @@ def main():
     st.sidebar.subheader("Stores to Search")
     st.sidebar.markdown("Select which stores to search for cards:")
     
-    store_options = {
-        "FaceToFaceGames": "facetoface",
-        "TopDeckHero": "topdeckhero",
-        "TopDeckBoucherville": "topdeckboucherville",
-        "TopDeckJoliette": "topdeckjoliette",
-        "MTGJeuxJubes": "mtgjeuxjubes"
-    }
-    
     selected_stores = st.sidebar.multiselect(
         "Stores",
-        options=list(store_options.keys()),
-        default=list(store_options.keys()),
+        options=STORE_NAMES,
+        default=STORE_NAMES,
         help="Choose which stores to search. More stores = better coverage but longer search time."
     )
     
     # TopDeck discount
-    topdeck_stores = ["TopDeckHero", "TopDeckBoucherville", "TopDeckJoliette"]
-    has_topdeck = any(store in selected_stores for store in topdeck_stores)
+    has_topdeck = any(store in selected_stores for store in TOPDECK_STORES)
     
     if has_topdeck:
         topdeckhero_discount = st.sidebar.checkbox(
@@ -138,19 +233,10 @@ def main():
     st.sidebar.subheader("Selection Strategy")
     st.sidebar.markdown("Choose how to select the best card from available offers:")
     
-    strategy_display_names = {
-        "cheapest": "Cheapest (any condition, any foiling)",
-        "cheapest-foil": "Cheapest Foil",
-        "cheapest-nonfoil": "Cheapest Non-Foil",
-        "foil-first-cheapest": "Foil First (prefer foil, fallback to non-foil)",
-        "best-condition": "Best Condition (cheapest Near Mint)",
-        "blingiest": "Blingiest (most expensive foil)"
-    }
-    
     strategy_choice = st.sidebar.selectbox(
         "Strategy",
-        options=list(strategy_display_names.keys()),
-        format_func=lambda x: strategy_display_names[x],
+        options=STRATEGY_NAMES,
+        format_func=STRATEGY_DISPLAY_NAMES.get,
         help="The strategy determines which card offer is selected when multiple options are available."
     )
     
@@ -158,21 +244,10 @@ def main():
     st.sidebar.subheader("Quality Filter")
     st.sidebar.markdown("Filter cards by minimum quality/condition:")
     
-    quality_display_names = {
-        "none": "No restriction (any condition)",
-        "mint": "Mint (M)",
-        "nm": "Near Mint (NM)",
-        "lp": "Lightly Played (LP)",
-        "mp": "Moderately Played (MP)",
-        "played": "Played (P)",
-        "hp": "Heavily Played (HP)",
-        "damaged": "Damaged"
-    }
-    
     min_quality_choice = st.sidebar.selectbox(
         "Minimum Quality",
-        options=list(quality_display_names.keys()),
-        format_func=lambda x: quality_display_names[x],
+        options=QUALITY_NAMES,
+        format_func=QUALITY_DISPLAY_NAMES.get,
         help="Only show cards at this quality level or better. For example, 'Lightly Played' will show LP, NM, and Mint cards."
     )
     
@@ -217,10 +292,13 @@ def main():
         clear_button = st.button("🗑️ Clear", use_container_width=True)
     
     if clear_button:
+        st.session_state.pop(RESULTS_KEY, None)
         st.rerun()
     
     # Process search
     if search_button:
+        st.session_state.pop(RESULTS_KEY, None)
+        
         if not card_input.strip():
             st.error("Please enter at least one card.")
             return
@@ -247,7 +325,7 @@ def main():
                 st.write(f"• {card.name}{set_info}{qty_info}")
         
         # Convert selected stores to filter string
-        store_filter = ",".join([store_options[s] for s in selected_stores])
+        store_filter = ",".join([STORE_OPTIONS[s] for s in selected_stores])
         
         # Search stores
         st.header("🔎 Searching Stores...")
@@ -256,16 +334,28 @@ def main():
         
         try:
             status_text.text("Searching stores for cards...")
+            
+            def show_search_progress(done: int, total: int) -> None:
+                # The search fills the bar up to 90%, the rest is for selection
+                progress_bar.progress(done * 90 // total)
+                status_text.text(f"Finished {done}/{total} searches...")
+            
+            # Repeated searches are served by the scrapers' memory and disk
+            # caches, which only keep successful results
             card_offers = search_all_stores(
                 cards,
                 store_filter=store_filter,
                 use_cache=use_cache,
-                topdeckhero_discount=topdeckhero_discount
+                topdeckhero_discount=topdeckhero_discount,
+                progress_callback=show_search_progress
             )
-            progress_bar.progress(50)
+            progress_bar.progress(90)
             
-            # Calculate total offers
-            total_offers = sum(len(offers) for offers in card_offers.values())
+            # Collect all offers for download
+            all_offers = []
+            for offers in card_offers.values():
+                all_offers.extend(offers)
+            total_offers = len(all_offers)
             
             if total_offers == 0:
                 progress_bar.progress(100)
@@ -294,58 +384,29 @@ def main():
                 st.warning("No suitable offers found matching your criteria. Try relaxing your filters.")
                 return
             
-            # Display results
-            st.header("✨ Results")
-            
-            # Summary metrics
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Total Offers Found", total_offers)
-            with col2:
-                st.metric("Cards with Offers", len(selected_offers))
-            with col3:
-                total_cost = sum(offer.price for offer in selected_offers)
-                st.metric("Total Cost", f"${total_cost:.2f}")
-            
-            # Results table (showing only selected offers for UI)
-            st.subheader("Best Deals (Selected)")
+            # Build the results table and Excel file once and keep them in the
+            # session state, so they stay on screen across reruns (such as the
+            # one triggered by clicking the download button) without searching again
             df = create_dataframe(selected_offers)
             df = df.sort_values(by="Price", ascending=True)
             
-            # Make URLs clickable
-            st.dataframe(
-                df,
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "URL": st.column_config.LinkColumn("URL"),
-                    "Price": st.column_config.NumberColumn("Price", format="$%.2f"),
-                    "Foil": st.column_config.CheckboxColumn("Foil")
-                }
-            )
-            
-            # Collect all offers for download
-            all_offers = []
-            for offers in card_offers.values():
-                all_offers.extend(offers)
-            
-            # Download button
-            st.subheader("📥 Download Results")
-            st.info(f"The Excel file will contain all {total_offers} offers with selected offers marked with a ✓")
-            excel_data = create_excel_download(all_offers, selected_offers)
-            st.download_button(
-                label="Download Excel File (All Offers)",
-                data=excel_data,
-                file_name="mtg_deal_finder_results.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+            st.session_state[RESULTS_KEY] = {
+                "total_offers": total_offers,
+                "selected_count": len(selected_offers),
+                "total_cost": calculate_total_cost(selected_offers),
+                "df": df,
+                "excel_data": create_excel_download(all_offers, selected_offers),
+            }
             
         except Exception as e:
             progress_bar.progress(100)
             status_text.text("Error occurred during search.")
             st.error(f"An error occurred: {str(e)}")
             logging.exception("Error during search")
+    
+    results = st.session_state.get(RESULTS_KEY)
+    if results:
+        show_results(results)
 
 
 if __name__ == "__main__":
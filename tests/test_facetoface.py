@@ -0,0 +1,36 @@
+"""
+Tests for parsing FaceToFaceGames API responses.
+"""
+
+import pytest
+
+from mtg_deal_finder.stores.facetoface import FaceToFaceScraper
+
+
+def _hit(variants):
+    return {
+        "_source": {
+            "title": "Sol Ring [Commander 2021]",
+            "handle": "sol-ring-c21",
+            "variants": variants,
+        }
+    }
+
+
+VARIANT = {
+    "price": 2.5,
+    "inventoryQuantity": 3,
+    "selectedOptions": [{"name": "Condition", "value": "NM"}],
+}
+
+
+@pytest.mark.parametrize("malformed", [None, 5])
+def test_malformed_variants_only_skip_their_hit(malformed):
+    scraper = FaceToFaceScraper(use_cache=False)
+    data = {"hits": {"hits": [_hit(malformed), _hit([VARIANT])]}}
+    
+    offers = scraper._parse_api_response(data, "Sol Ring")
+    
+    assert len(offers) == 1
+    assert offers[0].card == "Sol Ring"
+    assert offers[0].price == 2.5
@@ -0,0 +1,38 @@
+"""
+Tests for parsing card list lines.
+
+Expected cards are what the original string-splitting parser returned for
+the same lines.
+"""
+
+import pytest
+
+from mtg_deal_finder.cards import Card
+from mtg_deal_finder.main import parse_card_line
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Lightning Bolt", Card(name="Lightning Bolt")),
+    ("Counterspell (7ED)", Card(name="Counterspell", set="7ED")),
+    ("Brainstorm x4", Card(name="Brainstorm", qty=4)),
+    ("4x Brainstorm", Card(name="Brainstorm", qty=4)),
+    ("4 Brainstorm", Card(name="Brainstorm", qty=4)),
+    ("Counterspell (7ED) x2", Card(name="Counterspell", set="7ED", qty=2)),
+    ("1 Sol Ring (MIC) 169", Card(name="Sol Ring", set="MIC", qty=1)),
+    ("Sol Ring x2 (MIC) 169", Card(name="Sol Ring", qty=2)),
+    ("Lightning Bolt x4 (M11)", Card(name="Lightning Bolt", qty=4)),
+    ("Karn Liberated x 2", Card(name="Karn Liberated", qty=2)),
+    ("Sol Ring X3", Card(name="Sol Ring", qty=3)),
+    ("Sol Ring (C21) 263 x3", Card(name="Sol Ring", set="C21", qty=3)),
+])
+def test_parse_card_line_formats(line, expected):
+    assert parse_card_line(line, ignore_set=False) == expected
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# sideboard"])
+def test_parse_card_line_skips_blank_and_comment_lines(line):
+    assert parse_card_line(line) is None
+
+
+def test_parse_card_line_discards_set_by_default():
+    assert parse_card_line("Counterspell (7ED) x2") == Card(name="Counterspell", qty=2)